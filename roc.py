@@ -1,11 +0,0 @@
-import numpy as np
-
-def getROC():
-    """
-    """
-    pass
-
-def getAUC():
-    """
-    """
-    pass
\ No newline at end of file
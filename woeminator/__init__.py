@@ -0,0 +1,64 @@
+"""Weights of Evidence (and Frequency Ratio) for spatial data (landslides).
+
+The compute core (WoE, FR, sampling, reclassification, ROC) only needs NumPy. The GDAL based
+I/O (toArray, toRaster, loader) is imported on first use of one of its functions, GDAL itself
+only when a GDAL raster or vector is read or written. .npy / .npz files work without GDAL (see
+npyBackend).
+"""
+
+import importlib
+from .factorized import FactorizedRaster, factorizeArray
+from .fr import FR, FREnsemble
+from .randomize import SubsampleSet, getRandomArrays, getRandomMemberships
+from .reclassify import getReclassIndices, reclassify
+from .roc import getAUC, getROC
+from .sharedCalcFunctions import PartialCounts
+from .woe import WoE, WoEEnsemble
+
+# name: module, imported by __getattr__ on first use
+lazyNames = {
+    "raster2Array": "toArray",
+    "vector2Array": "toArray",
+    "iterRasterBlocks": "toArray",
+    "array2Raster": "toRaster",
+    "reclassifyRaster": "toRaster",
+    "reclassifyRasters": "toRaster",
+    "Loader": "loader",
+    "loadManifest": "loader",
+    "npy2Array": "npyBackend",
+    "array2Npy": "npyBackend",
+    "classifyArray": "classify",
+    "getBreaks": "classify",
+    "EnsembleAggregator": "aggregate",
+    "FactorStack": "stack",
+    "ResultCache": "cache",
+    "InventoryState": "incremental",
+    "runParallel": "parallel",
+    "runSharded": "parallel",
+}
+
+__all__ = [
+    "FactorizedRaster",
+    "factorizeArray",
+    "FR",
+    "FREnsemble",
+    "SubsampleSet",
+    "getRandomArrays",
+    "getRandomMemberships",
+    "getReclassIndices",
+    "reclassify",
+    "getAUC",
+    "getROC",
+    "PartialCounts",
+    "WoE",
+    "WoEEnsemble",
+    *lazyNames,
+]
+
+
+def __getattr__(name: str):
+    if name not in lazyNames:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{lazyNames[name]}", __name__), name)
+    globals()[name] = value  # __getattr__ is only called once per name
+    return value
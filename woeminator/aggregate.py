@@ -0,0 +1,110 @@
+import numpy as np
+
+# Online statistics over the resultsTables of an ensemble of WoE runs.
+
+
+class EnsembleAggregator:
+    """Accumulates the resultsTables of WoE subsample runs one at a time (Welford's algorithm),
+    without keeping the runs in memory. All runs must have the same classValue column.
+    After adding the runs with update, getStatisticsTable returns per class:
+    meanWeight: mean of classWeight over the runs
+    weightStd: ensemble (sample) standard deviation of classWeight
+    pooledVariance: mean of the analytical classVariance of the runs
+    studentizedContrast: mean classContrast / sqrt(mean contrast variance), with the contrast
+        variance σ²(W⁺) + σ²(W⁻) of each run
+    lowerBound / upperBound: meanWeight ∓ z * sqrt(weightStd² + pooledVariance)
+    writeRasters writes any of them as rasters in one pass.
+    """
+
+    def __init__(self, z=1.96):
+        self.z = z
+        self.runCount = 0
+        self.classValues = None
+
+    def update(self, resultsTable: np.ndarray):
+        """Adds the resultsTable of one run."""
+        if self.classValues is None:
+            self.classValues = resultsTable["classValue"].copy()
+            classCount = len(self.classValues)
+            self.meanWeight = np.zeros(classCount)
+            self.squaredWeightDeviations = np.zeros(classCount)  # Welford's M2
+            self.meanVariance = np.zeros(classCount)
+            self.meanContrast = np.zeros(classCount)
+            self.meanContrastVariance = np.zeros(classCount)
+        elif not np.array_equal(self.classValues, resultsTable["classValue"]):
+            raise ValueError("resultsTable has other classes than the previous runs")
+        self.runCount += 1
+        weight = resultsTable["classWeight"].astype(np.float64)
+        delta = weight - self.meanWeight
+        self.meanWeight += delta / self.runCount
+        self.squaredWeightDeviations += delta * (weight - self.meanWeight)
+        for mean, values in (
+            (self.meanVariance, resultsTable["classVariance"]),
+            (self.meanContrast, resultsTable["classContrast"]),
+            (
+                self.meanContrastVariance,
+                resultsTable["classPositiveVariance"].astype(np.float64)
+                + resultsTable["classNegativeVariance"],
+            ),
+        ):
+            mean += (values - mean) / self.runCount
+
+    def getStatisticsTable(self) -> np.ndarray:
+        """Returns a Numpy Array with one row per class and the columns classValue, meanWeight,
+        weightStd, pooledVariance, studentizedContrast, lowerBound and upperBound.
+        """
+        table = np.zeros(
+            shape=(len(self.classValues),),
+            dtype=[
+                ("classValue", "f"),
+                ("meanWeight", "f"),
+                ("weightStd", "f"),
+                ("pooledVariance", "f"),
+                ("studentizedContrast", "f"),
+                ("lowerBound", "f"),
+                ("upperBound", "f"),
+            ],
+        )
+        weightVariance = (
+            self.squaredWeightDeviations / (self.runCount - 1)
+            if self.runCount > 1
+            else np.zeros(len(self.classValues))
+        )
+        bound = self.z * np.sqrt(weightVariance + self.meanVariance)
+        table["classValue"] = self.classValues
+        table["meanWeight"] = self.meanWeight
+        table["weightStd"] = np.sqrt(weightVariance)
+        table["pooledVariance"] = self.meanVariance
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table["studentizedContrast"] = self.meanContrast / np.sqrt(
+                self.meanContrastVariance
+            )
+        table["lowerBound"] = self.meanWeight - bound
+        table["upperBound"] = self.meanWeight + bound
+        return table
+
+    def writeRasters(
+        self,
+        rasterPath: str,
+        outRasterPaths: dict,
+        noData=-9999,
+        bandNr=1,
+        **kwargs,
+    ) -> dict:
+        """Writes the statistics in outRasterPaths ({column: path}, e.g. {"meanWeight":
+        "mean.tif", "weightStd": "std.tif"}) as rasters of the factor raster at rasterPath in one
+        streaming pass (see toRaster.reclassifyRasters, which gets kwargs) and returns
+        outRasterPaths.
+        """
+        from .toRaster import reclassifyRasters
+
+        reclassifyRasters(
+            rasterPath,
+            list(outRasterPaths.values()),
+            self.getStatisticsTable(),
+            list(outRasterPaths.keys()),
+            noData,
+            bandNr,
+            **kwargs,
+        )
+        return outRasterPaths
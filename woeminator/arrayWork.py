@@ -0,0 +1,82 @@
+import numpy as np
+from . import sampling
+from .factorized import FactorizedRaster
+from .reclassify import reclassify
+
+
+def readyArray4calc(inputArray: np.ndarray) -> np.ndarray:
+    """Returns an array with each element not 0 or noData (-9999) replaced with 1.
+    Used to convert the randomized Arrays into a better format for calculation.
+    """
+    inputArray[inputArray >= 1] = 1  # We expect each value > 1 to be a landslide
+    return inputArray
+
+
+def fillArrayWithRandomNoDataUntilPercent(
+    inputArray: np.ndarray,
+    landslide=1,
+    noLandslide=0,
+    percent=30,
+    noData=-9999,
+    seed=42,
+) -> np.ndarray:
+    """Returns a modified inputArray where noLandslide values are randomly replaced with noData
+    until landslide values make up percent % of all elements in inputArray if the percentage of
+    landslides is too low, else it randomly replaces landslides with noData until percent % of all
+    elements in inputArray are landslides.
+    Modifies inputArray in place, see sampling.fillRandomNoDataUntilPercent.
+    """
+    return sampling.fillRandomNoDataUntilPercent(
+        inputArray, landslide, noLandslide, percent, noData, seed, inPlace=True
+    )
+
+
+def fillWithNoDataKeepingValueDistribution(
+    inputArray: np.ndarray, percent=20, noData=-9999, seed=42
+) -> np.ndarray:
+    """Returns a modified inputArray where only percent % of each value in it are kept and the rest
+    is filled with noData, keeping the original percentage distribution of the values or very
+    close to it. It will keep at least one of each value in inputArray in the returned array.
+    Modifies inputArray in place, see sampling.fillNoDataKeepingValueDistribution.
+    """
+    return sampling.fillNoDataKeepingValueDistribution(
+        inputArray, percent, noData, seed, inPlace=True
+    )
+
+
+def replaceValuesInArray(
+    inputArray: np.ndarray,
+    toReplace: np.ndarray,
+    replacement: np.ndarray,
+    changeType=True,
+) -> np.ndarray:
+    """
+    Returns an array where values in toReplace are replaced with values in replacement with the same index in
+    inputArray.
+    If a values is not in toReplace they will not be modified.
+    Every value is looked up once (see reclassify.reclassify), a replacement value that is also
+    in toReplace is not replaced again.
+    By default, it will change the inputArray type to match the replacement type. You can change that by setting
+    changeType to False.
+    inputArray may also be a FactorizedRaster, the result is then always a new array.
+    """
+    if isinstance(inputArray, FactorizedRaster) or (
+        changeType and inputArray.dtype != replacement.dtype
+    ):
+        out = None
+    else:
+        out = inputArray
+    return reclassify(
+        inputArray, toReplace, replacement, out=out, dtype=replacement.dtype
+    )
+
+
+if __name__ == "__main__":
+    import timeit
+    from . import randomize
+
+    trainlist, vallist = randomize.getRandomArrays(
+        np.arange(900).reshape(30, 30), 100, noData=899
+    )
+    for train in trainlist:
+        print(timeit.timeit("readyArray4calc(train)", globals=globals()))
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from .arrayWork import readyArray4calc, replaceValuesInArray
+from .fr import FR
+from .randomize import getRandomArrays
+from .woe import WoE
+
+# Reproducible benchmarks of the whole pipeline on synthetic data.
+# python -m woeminator.benchmark --size 2000 --classes 40 --output bench.json
+
+
+def makeFactorArray(size: int, classCount: int, seed=42, patchSize=16) -> np.ndarray:
+    """Returns a size x size int32 factor raster with classCount classes in square patches of
+    patchSize pixels and a noData (-9999) border of 1 % of the rows.
+    """
+    rng = np.random.default_rng(seed)
+    patchCount = -(-size // patchSize)
+    patches = rng.integers(1, classCount + 1, (patchCount, patchCount), dtype=np.int32)
+    factorArray = np.kron(patches, np.ones((patchSize, patchSize), dtype=np.int32))
+    factorArray = factorArray[:size, :size].copy()
+    factorArray[: max(1, size // 100)] = -9999
+    return factorArray
+
+
+def getLandslideSquares(size: int, lsCount: int, coverage: float, seed=42) -> list:
+    """Returns a list of (id, row, col, side) squares for lsCount landslides covering about
+    coverage (0 to 1) of a size x size raster.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(1, int(round((coverage * size * size / lsCount) ** 0.5)))
+    rows = rng.integers(0, size - side + 1, lsCount)
+    cols = rng.integers(0, size - side + 1, lsCount)
+    return [
+        (i + 1, int(row), int(col), side)
+        for i, (row, col) in enumerate(zip(rows, cols))
+    ]
+
+
+def makeLandslideArray(size: int, squares: list) -> np.ndarray:
+    """Returns a size x size landslide array with the ID of each square (see
+    getLandslideSquares), 0 elsewhere. Like vector2Array it is int16 if the IDs fit.
+    """
+    dtype = np.int16 if len(squares) < 2**15 else np.int32
+    lsArray = np.zeros((size, size), dtype=dtype)
+    for lsId, row, col, side in squares:
+        lsArray[row : row + side, col : col + side] = lsId
+    return lsArray
+
+
+def writeShapefile(path: str, size: int, squares: list, offset=0.0) -> str:
+    """Writes squares (see getLandslideSquares) as polygons with the ID in the field "number"
+    to a shapefile in the pixel coordinates of writeMaskRaster and returns path.
+    offset shifts the squares right and down, with 0.5 their edges run through pixel centres.
+    """
+    from osgeo import ogr
+
+    dataSource = ogr.GetDriverByName("ESRI Shapefile").CreateDataSource(path)
+    layer = dataSource.CreateLayer("landslides", geom_type=ogr.wkbPolygon)
+    layer.CreateField(ogr.FieldDefn("number", ogr.OFTInteger))
+    for lsId, row, col, side in squares:
+        col = col + offset
+        top = size - row - offset
+        ring = ogr.Geometry(ogr.wkbLinearRing)
+        for x, y in (
+            (col, top),
+            (col + side, top),
+            (col + side, top - side),
+            (col, top - side),
+        ):
+            ring.AddPoint_2D(x, y)
+        ring.CloseRings()
+        polygon = ogr.Geometry(ogr.wkbPolygon)
+        polygon.AddGeometry(ring)
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField("number", lsId)
+        feature.SetGeometry(polygon)
+        layer.CreateFeature(feature)
+    dataSource = None  # flush to disk
+    return path
+
+
+def writeMaskRaster(path: str, factorArray: np.ndarray) -> str:
+    """Writes factorArray as GeoTIFF with 1 unit pixels and the origin at the lower left corner
+    and returns path.
+    """
+    from osgeo import gdal
+
+    rows, cols = factorArray.shape
+    raster = gdal.GetDriverByName("GTiff").Create(path, cols, rows, 1, gdal.GDT_Int32)
+    raster.SetGeoTransform((0, 1, 0, rows, 0, -1))
+    raster.GetRasterBand(1).SetNoDataValue(-9999)
+    raster.GetRasterBand(1).WriteArray(factorArray)
+    raster = None  # flush to disk
+    return path
+
+
+def checkTiledRasterization(
+    tmpDir: str, maskPath: str, size: int, squares: list, tileSize=97
+) -> dict:
+    """Returns for each case ("offset0", "offset0.5", each with and without allTouched) whether
+    vector2Array with tiles of tileSize pixels (odd by default, so tiles do not line up with the
+    squares) returns exactly the array of the serial path. offset 0.5 puts the polygon edges on
+    pixel centres, where a shifted tile origin could round differently.
+    """
+    from .toArray import vector2Array
+
+    identical = {}
+    for offset in (0.0, 0.5):
+        shapePath = writeShapefile(
+            os.path.join(tmpDir, f"check{offset}.shp"), size, squares, offset
+        )
+        for allTouched in (False, True):
+            serial = vector2Array(shapePath, maskPath, "number", allTouched=allTouched)
+            tiled = vector2Array(
+                shapePath, maskPath, "number", allTouched=allTouched, tileSize=tileSize
+            )
+            identical[f"offset{offset:g}_allTouched{allTouched}"] = bool(
+                np.array_equal(serial, tiled)
+            )
+    return identical
+
+
+def getVersion():
+    """Returns the git commit of the code being benchmarked or None outside of a repository."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(function, setup=lambda: (), repeat=3) -> dict:
+    """Returns the best wall time of repeat calls of function(*setup()) in seconds and the peak
+    memory allocated during one call (tracemalloc, a separate untimed call).
+    setup is not timed.
+    """
+    seconds = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        function(*args)
+        seconds.append(time.perf_counter() - start)
+    args = setup()
+    startedTracing = (
+        not tracemalloc.is_tracing()
+    )  # do not stop tracing of e.g. instrument
+    if startedTracing:
+        tracemalloc.start()
+    startBytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    function(*args)
+    peakBytes = tracemalloc.get_traced_memory()[1] - startBytes
+    if startedTracing:
+        tracemalloc.stop()
+    return {"seconds": min(seconds), "peakBytes": peakBytes}
+
+
+def runBenchmarks(
+    size=1000, classCount=40, lsCount=500, coverage=0.02, count=10, repeat=3, seed=42
+) -> dict:
+    """Returns the benchmark results of the pipeline on synthetic data as dict."""
+    factorArray = makeFactorArray(size, classCount, seed)
+    squares = getLandslideSquares(size, lsCount, coverage, seed)
+    lsArray = makeLandslideArray(size, squares)
+    trainArray = readyArray4calc(getRandomArrays(lsArray, 1, seed=seed)[0][0])
+    resultsTable = WoE(factorArray, trainArray).resultsTable
+    results = {
+        "getRandomArrays": measure(
+            lambda: getRandomArrays(lsArray, count, seed=seed), repeat=repeat
+        ),
+        "readyArray4calc": measure(
+            readyArray4calc, lambda: (lsArray.copy(),), repeat=repeat
+        ),
+        "WoE": measure(lambda: WoE(factorArray, trainArray), repeat=repeat),
+        "FR": measure(lambda: FR(factorArray, trainArray), repeat=repeat),
+        "replaceValuesInArray": measure(
+            lambda: replaceValuesInArray(
+                factorArray, resultsTable["classValue"], resultsTable["classWeight"]
+            ),
+            repeat=repeat,
+        ),
+    }
+    checks = {}
+    skipped = {}  # step or check: reason
+    try:
+        from osgeo import gdal  # noqa: F401
+    except ImportError:
+        for name in (
+            "vector2Array",
+            "array2Raster",
+            "vector2ArrayTiled",
+            "tiledRasterizationIdentical",
+        ):
+            skipped[name] = "GDAL not available"
+    else:
+        from .toArray import vector2Array
+        from .toRaster import array2Raster
+
+        with tempfile.TemporaryDirectory() as tmpDir:
+            maskPath = writeMaskRaster(os.path.join(tmpDir, "mask.tif"), factorArray)
+            shapePath = writeShapefile(
+                os.path.join(tmpDir, "landslides.shp"), size, squares
+            )
+            weightsArray = replaceValuesInArray(
+                factorArray, resultsTable["classValue"], resultsTable["classWeight"]
+            )
+            results["vector2Array"] = measure(
+                lambda: vector2Array(shapePath, maskPath, "number"), repeat=repeat
+            )
+            results["array2Raster"] = measure(
+                lambda: array2Raster(
+                    weightsArray, maskPath, os.path.join(tmpDir, "out.tif")
+                ),
+                repeat=repeat,
+            )
+            results["vector2ArrayTiled"] = measure(
+                lambda: vector2Array(shapePath, maskPath, "number", tileSize=512),
+                repeat=repeat,
+            )
+            checks["tiledRasterizationIdentical"] = checkTiledRasterization(
+                tmpDir, maskPath, size, squares
+            )
+    return {
+        "parameters": {
+            "size": size,
+            "classCount": classCount,
+            "lsCount": lsCount,
+            "coverage": coverage,
+            "count": count,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "environment": {
+            "version": getVersion(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+        "skipped": skipped,
+        "checks": checks,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the pipeline on synthetic data."
+    )
+    parser.add_argument(
+        "--size", type=int, default=1000, help="raster rows and columns"
+    )
+    parser.add_argument("--classes", type=int, default=40, help="classes of the factor")
+    parser.add_argument(
+        "--landslides", type=int, default=500, help="amount of landslides"
+    )
+    parser.add_argument(
+        "--coverage", type=float, default=0.02, help="share of area with landslides"
+    )
+    parser.add_argument("--count", type=int, default=10, help="random subsamples")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per step")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark.json", help="JSON result file")
+    args = parser.parse_args()
+    benchmark = runBenchmarks(
+        args.size,
+        args.classes,
+        args.landslides,
+        args.coverage,
+        args.count,
+        args.repeat,
+        args.seed,
+    )
+    for name, result in benchmark["results"].items():
+        print(
+            f"{name:<22}{result['seconds']:>10.4f} s{result['peakBytes'] / 2**20:>10.1f} MiB"
+        )
+    for name, reason in benchmark["skipped"].items():
+        print(f"{name:<22} skipped: {reason}")
+    tiledChecks = benchmark["checks"].get("tiledRasterizationIdentical", {})
+    for name, identical in tiledChecks.items():
+        print(f"tiled == serial {name:<24}{identical}")
+    with open(args.output, "w") as outputFile:
+        json.dump(benchmark, outputFile, indent=2)
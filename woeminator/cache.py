@@ -0,0 +1,227 @@
+import hashlib
+import os
+import weakref
+from collections import OrderedDict
+import numpy as np
+
+# Size bounded on-disk cache of Numpy arrays and a memoizing cache of WoE / FR results.
+
+
+def getCacheKey(*parts) -> str:
+    """Returns a hex digest identifying parts (anything with a stable repr)."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def getFileStamp(path: str) -> tuple:
+    """Returns (name, size, mtime) of path and of every file next to it with the same name but
+    another extension (e.g. .shx, .dbf, .prj of a shapefile).
+    """
+    stem = os.path.splitext(path)[0]
+    folder = os.path.dirname(os.path.abspath(path))
+    stamps = []
+    for name in sorted(os.listdir(folder)):
+        filePath = os.path.join(folder, name)
+        if os.path.splitext(filePath)[0] == os.path.abspath(stem):
+            stat = os.stat(filePath)
+            stamps.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
+class NpyCache:
+    """A directory of .npy files with at most maxBytes in total. Reading or writing an entry marks
+    it as recently used (mtime), the least recently used entries are deleted first.
+    Entries are loaded memory-mapped copy-on-write: changing the returned array does not change
+    the cache.
+    """
+
+    def __init__(self, cacheDir: str, maxBytes=2**32):
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        os.makedirs(cacheDir, exist_ok=True)
+
+    def getPath(self, key: str) -> str:
+        return os.path.join(self.cacheDir, f"{key}.npy")
+
+    def get(self, key: str):
+        """Returns the memory-mapped array stored under key or None if there is none."""
+        path = self.getPath(key)
+        try:
+            array = np.load(path, mmap_mode="c")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # evicted by another process, the mapping stays valid
+            pass
+        return array
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """Stores array under key, evicts old entries and returns the memory-mapped entry."""
+        path = self.getPath(key)
+        tmpPath = f"{path}.{os.getpid()}.tmp"
+        with open(tmpPath, "wb") as tmpFile:
+            np.save(tmpFile, array)
+        os.replace(tmpPath, path)  # atomic, other processes never see half a file
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="c")
+
+    def evict(self, keep=None):
+        """Deletes the least recently used entries until the cache fits into maxBytes.
+        The entry at path keep is never deleted.
+        """
+        entries = []
+        for name in os.listdir(self.cacheDir):
+            if name.endswith(".npy"):
+                try:
+                    stat = os.stat(os.path.join(self.cacheDir, name))
+                except FileNotFoundError:  # deleted by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        totalBytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if totalBytes <= self.maxBytes:
+                break
+            path = os.path.join(self.cacheDir, name)
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            totalBytes -= size
+
+
+def getArrayHash(array) -> str:
+    """Returns a hex digest of the shape, type and content of array (blake2b, one pass over the
+    bytes). A FactorizedRaster is hashed by its codes, classValues and noData.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if not isinstance(array, np.ndarray) and hasattr(array, "codes"):
+        digest.update(repr(array.noData).encode())
+        parts = [array.codes, array.classValues]
+    else:
+        parts = [array]
+    for part in parts:
+        part = np.ascontiguousarray(part)
+        digest.update(repr((part.shape, part.dtype.str)).encode())
+        digest.update(part.data.cast("B"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Memoizes the resultsTables of WoE and FR (or any method with a resultsTable) by content:
+    the key combines the method, a hash of the factor raster, a hash of the landslide inventory,
+    the landslide IDs of the subsample and noData. Repeated calls with the same inputs return the
+    cached resultsTable without scanning the raster.
+    The tables are kept in memory (least recently used first out beyond maxBytes) and, if cacheDir
+    is given, also on disk in a NpyCache of at most diskBytes, shared between runs.
+    The hash of an array is computed once and remembered as long as the array exists, so arrays
+    must not be changed in place while the cache is used (or call forget(array) afterwards).
+    hits, diskHits and misses count the lookups (see getStats).
+    """
+
+    def __init__(self, maxBytes=2**28, cacheDir=None, diskBytes=2**32):
+        self.maxBytes = maxBytes
+        self.tables = OrderedDict()
+        self.tableBytes = 0
+        self.diskCache = None if cacheDir is None else NpyCache(cacheDir, diskBytes)
+        self.arrayHashes = {}  # id(array): (weakref to array, hash)
+        self.allIds = {}  # (hash of lsArray, noData): IDs in lsArray
+        self.hits = self.diskHits = self.misses = 0
+
+    def getHash(self, array) -> str:
+        """Returns getArrayHash(array), computed only once per array object."""
+        key = id(array)
+        if key in self.arrayHashes:
+            reference, arrayHash = self.arrayHashes[key]
+            if reference() is array:
+                return arrayHash
+        arrayHash = getArrayHash(array)
+        self.arrayHashes[key] = (weakref.ref(array, self.dropHash), arrayHash)
+        return arrayHash
+
+    def dropHash(self, reference):
+        """Called when an array with a remembered hash is deleted, its id can be reused."""
+        for key, (knownReference, _) in list(self.arrayHashes.items()):
+            if knownReference is reference:
+                del self.arrayHashes[key]
+
+    def forget(self, array):
+        """Forgets the remembered hash of array, e.g. after changing it in place."""
+        self.arrayHashes.pop(id(array), None)
+
+    def getKey(self, method, rasterArray, lsArray, lsIds, noData) -> str:
+        """Returns the cache key of method(rasterArray, subsample of lsArray with lsIds, noData).
+        The IDs are compared as a set of int64, so the order and type of lsIds do not matter. IDs
+        not in lsArray are ignored and lsIds=None is the same as all IDs of lsArray.
+        """
+        allIds = self.getAllIds(lsArray, noData)
+        if lsIds is None:
+            lsIds = allIds
+        else:
+            lsIds = np.intersect1d(np.asarray(lsIds).astype(np.int64), allIds)
+        return getCacheKey(
+            "ResultCache",
+            method.__name__,
+            self.getHash(rasterArray),
+            self.getHash(lsArray),
+            getArrayHash(lsIds),
+            noData,
+        )
+
+    def getAllIds(self, lsArray: np.ndarray, noData) -> np.ndarray:
+        """Returns the sorted int64 landslide IDs of lsArray, found once per array and noData."""
+        key = (self.getHash(lsArray), noData)
+        if key not in self.allIds:
+            lsIds = np.unique(lsArray).astype(np.int64)
+            self.allIds[key] = lsIds[(lsIds != noData) & (lsIds != 0)]
+        return self.allIds[key]
+
+    def getResultsTable(
+        self, method, rasterArray, lsArray: np.ndarray, lsIds=None, noData=-9999
+    ) -> np.ndarray:
+        """Returns the resultsTable of method (WoE or FR) for rasterArray and the landslides of
+        lsArray (an individual ID per landslide, see vector2Array) with an ID in lsIds, by default
+        all landslides. Calculated only if it is not cached yet.
+        """
+        key = self.getKey(method, rasterArray, lsArray, lsIds, noData)
+        if key in self.tables:
+            self.hits += 1
+            self.tables.move_to_end(key)
+            return self.tables[key].copy()
+        if self.diskCache is not None:
+            resultsTable = self.diskCache.get(key)
+            if resultsTable is not None:
+                self.diskHits += 1
+                return self.remember(key, np.array(resultsTable))
+        self.misses += 1
+        lsMask = (lsArray != noData) & (lsArray != 0)
+        if lsIds is not None:
+            lsMask &= np.isin(lsArray, lsIds)
+        # 1 = landslide, 0 = no landslide, noData stays noData
+        trainArray = np.where(lsArray == noData, noData, lsMask).astype(lsArray.dtype)
+        resultsTable = method(rasterArray, trainArray, noData).resultsTable
+        if self.diskCache is not None:
+            self.diskCache.put(key, resultsTable)
+        return self.remember(key, resultsTable)
+
+    def remember(self, key: str, resultsTable: np.ndarray) -> np.ndarray:
+        """Keeps resultsTable in memory under key, drops the least recently used tables beyond
+        maxBytes and returns a copy of resultsTable.
+        """
+        self.tables[key] = resultsTable
+        self.tableBytes += resultsTable.nbytes
+        while self.tableBytes > self.maxBytes and len(self.tables) > 1:
+            _, dropped = self.tables.popitem(last=False)
+            self.tableBytes -= dropped.nbytes
+        return resultsTable.copy()
+
+    def getStats(self) -> dict:
+        """Returns the hits (memory), diskHits, misses and the tables and bytes in memory."""
+        return {
+            "hits": self.hits,
+            "diskHits": self.diskHits,
+            "misses": self.misses,
+            "tables": len(self.tables),
+            "bytes": self.tableBytes,
+        }
@@ -0,0 +1,131 @@
+import numpy as np
+
+# Classification of continuous rasters (DEM, slope, distances) into classes for
+# WoE / FR. The breaks come from a streamed histogram instead of a full sort, keep
+# them to classify the raster the same way when the map is generated.
+
+
+def iterSourceBlocks(source, bandNr=1, windowBudget=2**26):
+    """Yields the blocks of source: source itself if it is an array, else the windows of the
+    raster at the path source (see toArray.iterRasterBlocks).
+    """
+    if isinstance(source, np.ndarray):
+        yield source
+    else:
+        from .toArray import iterRasterBlocks
+
+        for _, _, (block,) in iterRasterBlocks([source], [bandNr], windowBudget):
+            yield block
+
+
+def getValidValues(block: np.ndarray, noData) -> np.ndarray:
+    """Returns the values of block that are neither noData nor NaN."""
+    values = block[block != noData]
+    if np.issubdtype(values.dtype, np.floating):
+        values = values[~np.isnan(values)]
+    return values
+
+
+def getHistogram(
+    source, noData=-9999, binCount=1024, bandNr=1, windowBudget=2**26
+) -> tuple:
+    """Returns a tuple (counts, edges), the histogram of source (array or raster path) with
+    binCount bins between its minimum and maximum. Streams source twice, first for the range,
+    then for the counts.
+    """
+    minValue = np.inf
+    maxValue = -np.inf
+    for block in iterSourceBlocks(source, bandNr, windowBudget):
+        values = getValidValues(block, noData)
+        if len(values):
+            minValue = min(minValue, values.min())
+            maxValue = max(maxValue, values.max())
+    if minValue > maxValue:
+        raise ValueError("source contains only noData")
+    edges = np.linspace(minValue, maxValue, binCount + 1)
+    counts = np.zeros(binCount, dtype=np.int64)
+    for block in iterSourceBlocks(source, bandNr, windowBudget):
+        counts += np.histogram(getValidValues(block, noData), edges)[0]
+    return counts, edges
+
+
+def getBreaks(
+    source,
+    classCount: int,
+    method="equalInterval",
+    noData=-9999,
+    binCount=1024,
+    bandNr=1,
+    windowBudget=2**26,
+) -> np.ndarray:
+    """Returns the inner class breaks (at most classCount - 1 ascending values) of source, an
+    array or the path to a raster that is read window by window (see getHistogram).
+    method is "equalInterval", "quantile" or "naturalBreaks" (Jenks). quantile and
+    naturalBreaks are calculated on the histogram, so their breaks are bin edges and precise to
+    (max - min) / binCount. naturalBreaks needs binCount² floats of memory.
+    Breaks that fall on the same edge are merged, so fewer classes are possible.
+    """
+    counts, edges = getHistogram(source, noData, binCount, bandNr, windowBudget)
+    if method == "equalInterval":
+        return np.linspace(edges[0], edges[-1], classCount + 1)[1:-1]
+    elif method == "quantile":
+        cumulativeCounts = np.cumsum(counts)
+        targets = cumulativeCounts[-1] * np.arange(1, classCount) / classCount
+        breakBins = np.searchsorted(cumulativeCounts, targets) + 1
+        return np.unique(edges[breakBins[breakBins < binCount]])
+    elif method == "naturalBreaks":
+        return getNaturalBreaks(counts, edges, classCount)
+    raise ValueError(
+        f'method has to be "equalInterval", "quantile" or "naturalBreaks", not {method}'
+    )
+
+
+def getNaturalBreaks(
+    counts: np.ndarray, edges: np.ndarray, classCount: int
+) -> np.ndarray:
+    """Returns the inner Jenks natural breaks of a histogram: the classes of bins with the
+    smallest sum of squared deviations from the class means (Fisher's dynamic programming with
+    the bin centers weighted by counts). The breaks are the lower edges of the first bin of
+    each class.
+    """
+    usedBins = np.flatnonzero(counts)
+    centers = ((edges[:-1] + edges[1:]) / 2)[usedBins]
+    weights = counts[usedBins].astype(np.float64)
+    binCount = len(usedBins)
+    classCount = min(classCount, binCount)
+    # prefix sums -> squared deviation of bins i..j in O(1)
+    w = np.concatenate([[0], np.cumsum(weights)])
+    s1 = np.concatenate([[0], np.cumsum(weights * centers)])
+    s2 = np.concatenate([[0], np.cumsum(weights * centers**2)])
+    i, j = np.triu_indices(binCount)
+    deviation = np.full((binCount, binCount), np.inf)  # deviation[i, j]: bins i..j
+    deviation[i, j] = (s2[j + 1] - s2[i]) - (s1[j + 1] - s1[i]) ** 2 / (w[j + 1] - w[i])
+    cost = deviation[0]  # cost[j]: best cost of bins 0..j in k + 1 classes
+    starts = []  # starts[k - 1][j]: first bin of the last class of the best solution
+    for _ in range(1, classCount):
+        # a new last class starting at bin i >= 1 after the best solution for bins 0..i-1
+        candidates = cost[:-1, None] + deviation[1:]
+        starts.append(np.argmin(candidates, axis=0) + 1)
+        cost = np.concatenate([[np.inf], candidates.min(axis=0)[1:]])
+    breakBins = []
+    end = binCount - 1
+    for start in reversed(starts):
+        end = start[end]
+        breakBins.append(end)
+        end -= 1
+    return edges[usedBins[breakBins[::-1]]]
+
+
+def classifyArray(
+    inputArray: np.ndarray, breaks: np.ndarray, noData=-9999, dtype=np.int16
+) -> np.ndarray:
+    """Returns an array of dtype with the class (1 to len(breaks) + 1) of each element of
+    inputArray. Class k holds the values >= breaks[k - 2] and < breaks[k - 1].
+    noData (and NaN) stay noData, so the result can be passed to WoE and FR directly.
+    """
+    classArray = (np.searchsorted(breaks, inputArray, side="right") + 1).astype(dtype)
+    noDataMask = inputArray == noData
+    if np.issubdtype(inputArray.dtype, np.floating):
+        noDataMask |= np.isnan(inputArray)
+    classArray[noDataMask] = noData
+    return classArray
@@ -0,0 +1,91 @@
+import numpy as np
+
+# Rasters encoded into small unsigned class codes, so the classes are only found once.
+
+
+class FactorizedRaster:
+    """A raster encoded as codes (smallest sufficient unsigned type) indexing classValues.
+    Pixels with the code noDataCode (= len(classValues)) are noData.
+    Create it with FactorizedRaster.fromArray(rasterArray, noData) or FactorizedRaster.load(path).
+    Can be passed instead of the raster array to WoE, FR and replaceValuesInArray.
+    """
+
+    def __init__(self, codes: np.ndarray, classValues: np.ndarray, noData=-9999):
+        self.codes = codes
+        self.classValues = classValues
+        self.noData = noData
+
+    @classmethod
+    def fromArray(cls, rasterArray: np.ndarray, noData=-9999) -> "FactorizedRaster":
+        """Returns the FactorizedRaster of rasterArray (see factorizeArray)."""
+        classValues, codes = factorizeArray(rasterArray, noData)
+        return cls(codes, classValues, noData)
+
+    @classmethod
+    def load(cls, path: str) -> "FactorizedRaster":
+        """Returns the FactorizedRaster saved at path (see save)."""
+        with np.load(path) as npz:
+            return cls(npz["codes"], npz["classValues"], npz["noData"].item())
+
+    def save(self, path: str, compressed=False) -> str:
+        """Saves codes, classValues and noData as .npz at path and returns path."""
+        saveFunction = np.savez_compressed if compressed else np.savez
+        saveFunction(
+            path, codes=self.codes, classValues=self.classValues, noData=self.noData
+        )
+        return path
+
+    @property
+    def noDataCode(self) -> int:
+        return len(self.classValues)
+
+    @property
+    def shape(self) -> tuple:
+        return self.codes.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        """The type of the class values (the decoded raster)."""
+        return self.classValues.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes of codes and classValues."""
+        return self.codes.nbytes + self.classValues.nbytes
+
+    def toArray(self) -> np.ndarray:
+        """Returns the decoded raster with noData for noData pixels."""
+        return np.append(self.classValues, self.noData).astype(self.dtype)[self.codes]
+
+
+def factorizeArray(rasterArray, noData=-9999) -> tuple:
+    """Returns a tuple (classValues, codes).
+    classValues holds the unique values in rasterArray without noData (same as getClassValues).
+    codes has the shape of rasterArray and holds the index into classValues for every pixel,
+    noData pixels get the code len(classValues). codes uses the smallest unsigned type that fits.
+    Integer rasters with a value range not larger than the raster are factorized with a lookup
+    table in one pass, everything else falls back to np.unique.
+    A FactorizedRaster is returned as it is (its own noData applies).
+    """
+    if isinstance(rasterArray, FactorizedRaster):
+        return rasterArray.classValues, rasterArray.codes
+    flat = np.ravel(rasterArray)
+    valid = flat != noData
+    if np.issubdtype(flat.dtype, np.integer) and valid.any():
+        minValue = int(flat[valid].min())
+        span = int(flat[valid].max()) - minValue + 1
+        if span <= max(flat.size, 2**16):
+            offsets = flat.astype(np.intp) - minValue
+            offsets[~valid] = span  # extra bin for noData
+            present = np.bincount(offsets, minlength=span + 1)[:span] > 0
+            classValues = (np.flatnonzero(present) + minValue).astype(flat.dtype)
+            codeType = np.min_scalar_type(len(classValues))
+            lut = np.full(span + 1, len(classValues), dtype=codeType)
+            lut[:span][present] = np.arange(len(classValues), dtype=codeType)
+            return classValues, lut[offsets].reshape(np.shape(rasterArray))
+    classValues, inverse = np.unique(flat[valid], return_inverse=True)
+    codes = np.full(
+        flat.shape, len(classValues), dtype=np.min_scalar_type(len(classValues))
+    )
+    codes[valid] = inverse.ravel()
+    return classValues, codes.reshape(np.shape(rasterArray))
@@ -0,0 +1,182 @@
+import numpy as np
+from .instrument import stage
+from .sharedCalcFunctions import (
+    PartialCounts,
+    getClassCounts,
+    getEnsembleResultsTables,
+    getLandslideTotalCount,
+    getRasterFileCounts,
+    getTotalCount,
+)
+
+
+class FR:
+    """After calling FR(raster, landslides, noData) FR.resultsTable contains the results of the
+    calculation (see getResultsTableFR).
+    """
+
+    def __init__(self, rasterArray: np.ndarray, lsArray: np.ndarray, noData=-9999):
+        with stage("FR.count", rasterArray=rasterArray, lsArray=lsArray):
+            lsTotalCount = getLandslideTotalCount(
+                lsArray, noData, 0
+            )  # 0 = noLandslideValue
+            totalCount = getTotalCount(rasterArray, noData)
+            classValues, classCount, lsClassCount = getClassCounts(
+                rasterArray, lsArray, noData
+            )
+        with stage("FR.resultsTable"):
+            self.fillResultsTable(
+                classValues, classCount, lsClassCount, lsTotalCount, totalCount
+            )
+
+    @classmethod
+    def fromCounts(
+        cls,
+        classValues: np.ndarray,
+        classCount: np.ndarray,
+        lsClassCount: np.ndarray,
+        lsTotalCount: int,
+        totalCount: int,
+    ) -> "FR":
+        """Returns a FR with a resultsTable calculated from already counted pixels
+        (see fillResultsTable) instead of a raster and a landslide array.
+        """
+        fr = cls.__new__(cls)
+        fr.fillResultsTable(
+            classValues, classCount, lsClassCount, lsTotalCount, totalCount
+        )
+        return fr
+
+    @classmethod
+    def fromPartialCounts(cls, partialCounts: PartialCounts) -> "FR":
+        """Returns a FR with a resultsTable calculated from partialCounts, e.g. the sum of the
+        PartialCounts of all tiles of a raster.
+        """
+        return cls.fromCounts(
+            partialCounts.classValues,
+            partialCounts.classCount,
+            partialCounts.lsClassCount,
+            partialCounts.lsTotalCount,
+            partialCounts.totalCount,
+        )
+
+    @classmethod
+    def fromRasterFiles(
+        cls,
+        rasterPath: str,
+        lsRasterPath: str,
+        noData=-9999,
+        bandNr=1,
+        windowBudget=2**26,
+        breaks=None,
+    ) -> "FR":
+        """Returns a FR calculated from the raster at rasterPath (band bandNr) and the landslide
+        raster at lsRasterPath without loading either of them completely. The counts are
+        accumulated window by window, each window of both rasters needs at most windowBudget
+        bytes (see toArray.iterRasterBlocks). The resultsTable matches FR(raster, landslides).
+        For a continuous raster pass breaks (see classify.getBreaks) to classify each window
+        with classify.classifyArray first.
+        """
+        return cls.fromPartialCounts(
+            getRasterFileCounts(
+                rasterPath, lsRasterPath, noData, bandNr, windowBudget, breaks
+            )
+        )
+
+    def fillResultsTable(
+        self,
+        classValues: np.ndarray,
+        classCount: np.ndarray,
+        lsClassCount: np.ndarray,
+        lsTotalCount: int,
+        totalCount: int,
+    ) -> np.ndarray:
+        """Creates and returns self.resultsTable from the per class counts.
+        Every column is calculated as a whole-array operation.
+        """
+        totalStableCount = totalCount - lsTotalCount
+        self.resultsTable = self.getResultsTableFR(len(classValues))
+        table = self.resultsTable
+        table["classValue"] = classValues
+        table["classCount"] = classCount
+        table["lsClassCount"] = lsClassCount
+        table["stableClassCount"] = table["classCount"] - table["lsClassCount"]
+        table["lsOutClassCount"] = lsTotalCount - table["lsClassCount"]
+        table["stableOutClassCount"] = totalStableCount - table["stableClassCount"]
+        table["classFrequencyRatio"] = self.getFrequencyRatio(
+            table["lsClassCount"], table["classCount"], lsTotalCount, totalCount
+        )
+        return self.resultsTable
+
+    def getResultsTableFR(self, classArrayCount: int) -> np.ndarray:
+        """Returns a Numpy Array, to be filled with the calculation results.
+        The size of the of the array is based on the number of classes in the input Layer.
+        """
+        return np.zeros(
+            shape=(classArrayCount,),
+            dtype=[
+                ("classValue", "f"),
+                ("classCount", "i"),
+                ("lsClassCount", "i"),
+                ("stableClassCount", "i"),
+                ("lsOutClassCount", "i"),
+                ("stableOutClassCount", "i"),
+                ("classFrequencyRatio", "f"),
+            ],
+        )
+
+    def getFrequencyRatio(
+        self, lsClassCount: int, classCount: int, lsTotalCount: int, totalCount: int
+    ) -> float:
+        """
+        Calculates and returns the Frequncy Ratio for a class of raster.
+             Landslide Pixels in Class / Total Pixels in class
+        FR = -------------------------------------------------
+             Total landslide Pixels / Total Pixels
+        """
+        return (lsClassCount / classCount) / (lsTotalCount / totalCount)
+
+
+class FREnsemble:
+    """After calling FREnsemble(raster, landslides, count, percent, seed, noData)
+    FREnsemble.resultsTables contains one resultsTable (see FR.getResultsTableFR) for each
+    of count random training subsamples with percent % of the landslides.
+    Expects landslides to hold an individual ID for each landslide (see vector2Array), 0 means no
+    landslide. The subsamples are the same getRandomArrays draws for the same count, percent and
+    seed, but the raster is only scanned once: a (landslide ID x class) table is counted and every
+    subsample is derived from it with a matrix product over the ID memberships.
+    """
+
+    def __init__(
+        self,
+        rasterArray: np.ndarray,
+        lsArray: np.ndarray,
+        count: int,
+        percent=80,
+        seed=42,
+        noData=-9999,
+    ):
+        self.lsIds, self.memberships, self.resultsTables = getEnsembleResultsTables(
+            FR, rasterArray, lsArray, count, percent, seed, noData
+        )
+
+
+if __name__ == "__main__":
+    import time
+    from . import toArray
+    from . import randomize
+    from . import arrayWork
+
+    t1 = time.perf_counter()
+    lsArray = toArray.vector2Array(
+        "testdata/landslides.shp", "testdata/AW3D30.tif", "number"
+    )
+    rasterArray = toArray.raster2Array("testdata/geology.tif")
+    trainList, valList = randomize.getRandomArrays(lsArray, 1, 100)
+    trainReadyForCalc = [*map(arrayWork.readyArray4calc, trainList)]
+    print(trainReadyForCalc[0].all() == lsArray.all())
+    for train in trainReadyForCalc:
+        FRr = FR(rasterArray, train, -9999)
+        print(FRr.resultsTable["classFrequencyRatio"])
+    t2 = time.perf_counter()
+    print(t2 - t1)
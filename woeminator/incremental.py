@@ -0,0 +1,168 @@
+import json
+import os
+import numpy as np
+from .factorized import factorizeArray
+from .fr import FR
+from .sharedCalcFunctions import PartialCounts
+from .woe import WoE
+
+# Incremental WoE / FR updates for a growing landslide inventory. The per class
+# counts of every factor and the rasterized inventory are kept in a state
+# directory, added or removed polygons only touch the window they cover.
+
+
+def getLandslideMask(lsArray: np.ndarray, noData=-9999) -> np.ndarray:
+    """Returns a boolean array, True for every landslide pixel (not 0 and not noData)."""
+    return (lsArray != noData) & (lsArray != 0)
+
+
+class InventoryState:
+    """Persistent state in stateDir: the rasterized inventory (landslides.npy, one ID per pixel),
+    the PartialCounts of each factor (<name>.npz) and state.json with the mask raster, the factor
+    rasters and noData. Create it once with InventoryState.create, then open it with
+    InventoryState(stateDir) and apply the weekly changes with addLandslides and
+    removeLandslides. getWoE / getFR return the updated results.
+    A pixel holds only one landslide ID, so removing a landslide also clears pixels it shares
+    with an overlapping landslide that was burned before it.
+    """
+
+    def __init__(self, stateDir: str):
+        self.stateDir = stateDir
+        with open(os.path.join(stateDir, "state.json")) as stateFile:
+            state = json.load(stateFile)
+        self.maskRasterPath = state["maskRasterPath"]
+        self.factors = state["factors"]  # name: [rasterPath, bandNr]
+        self.noData = state["noData"]
+        self.lsArray = np.load(os.path.join(stateDir, "landslides.npy"), mmap_mode="r+")
+        self.counts = {
+            name: PartialCounts.load(os.path.join(stateDir, f"{name}.npz"))
+            for name in self.factors
+        }
+
+    @classmethod
+    def create(
+        cls,
+        stateDir: str,
+        maskRasterPath: str,
+        factors: dict,
+        lsArray: np.ndarray,
+        noData=-9999,
+    ) -> "InventoryState":
+        """Creates the state in stateDir and returns it. factors maps a name to the path of a
+        factor raster (band 1) or a (path, bandNr) tuple. lsArray is the full inventory from
+        vector2Array(vectorPath, maskRasterPath, burnField, noData).
+        """
+        from .toArray import raster2Array
+
+        os.makedirs(stateDir, exist_ok=True)
+        np.save(os.path.join(stateDir, "landslides.npy"), lsArray)
+        factors = {
+            name: [factor, 1] if isinstance(factor, str) else list(factor)
+            for name, factor in factors.items()
+        }
+        isLandslide = getLandslideMask(lsArray, noData).view(np.int8)
+        for name, (rasterPath, bandNr) in factors.items():
+            PartialCounts.fromArrays(
+                raster2Array(rasterPath, bandNr), isLandslide, noData
+            ).save(os.path.join(stateDir, f"{name}.npz"))
+        with open(os.path.join(stateDir, "state.json"), "w") as stateFile:
+            json.dump(
+                {
+                    "maskRasterPath": maskRasterPath,
+                    "factors": factors,
+                    "noData": noData,
+                },
+                stateFile,
+            )
+        return cls(stateDir)
+
+    def addLandslides(self, vectorPath: str, burnField: str):
+        """Adds the polygons at vectorPath (burnField holds their IDs, see vector2Array) to the
+        inventory. Only the window covering them is rasterized and counted.
+        """
+        from .toArray import getLayerWindow, vector2Array
+
+        window = getLayerWindow(vectorPath, self.maskRasterPath)
+        if window is None:
+            return
+        added = vector2Array(
+            vectorPath, self.maskRasterPath, burnField, self.noData, window=window
+        )
+        current = self.getWindowArray(window)
+        self.updateWindow(window, np.where(added > 0, added, current))
+
+    def removeLandslides(self, vectorPath: str, burnField: str):
+        """Removes the polygons at vectorPath (burnField holds their IDs) from the inventory.
+        Only pixels that still hold the ID of a removed polygon are cleared.
+        """
+        from .toArray import getLayerWindow, vector2Array
+
+        window = getLayerWindow(vectorPath, self.maskRasterPath)
+        if window is None:
+            return
+        removed = vector2Array(
+            vectorPath, self.maskRasterPath, burnField, self.noData, window=window
+        )
+        current = self.getWindowArray(window)
+        self.updateWindow(
+            window, np.where((removed > 0) & (current == removed), 0, current)
+        )
+
+    def getWindowArray(self, window: tuple) -> np.ndarray:
+        """Returns the view of window (xOff, yOff, xSize, ySize) of the stored inventory."""
+        xOff, yOff, xSize, ySize = window
+        return self.lsArray[yOff : yOff + ySize, xOff : xOff + xSize]
+
+    def updateWindow(self, window: tuple, updated: np.ndarray):
+        """Replaces window of the inventory with updated and adjusts lsClassCount and lsTotalCount
+        of every factor by the gained and lost landslide pixels.
+        The new counts of all factors are calculated first and saved (each file replaced
+        atomically), then the inventory window is written, so a failed update changes nothing
+        and can be retried. self.counts is only replaced when everything succeeded.
+        """
+        from .toArray import readWindow
+
+        current = self.getWindowArray(window)
+        before = getLandslideMask(current, self.noData)
+        after = getLandslideMask(updated, self.noData)
+        gained = after & ~before
+        lost = before & ~after
+        lsTotalChange = int(gained.sum()) - int(lost.sum())
+        updatedCounts = {}
+        for name, (rasterPath, bandNr) in self.factors.items():
+            counts = self.counts[name]
+            classValues, codes = factorizeArray(
+                readWindow(rasterPath, window, bandNr), self.noData
+            )
+            binCount = len(classValues) + 1  # last bin = noData
+            gainedCount = np.bincount(codes[gained], minlength=binCount)
+            lostCount = np.bincount(codes[lost], minlength=binCount)
+            lsClassCount = counts.lsClassCount.copy()
+            classIndices = np.searchsorted(counts.classValues, classValues)
+            lsClassCount[classIndices] += (gainedCount - lostCount)[:-1]
+            updatedCounts[name] = PartialCounts(
+                counts.classValues,
+                counts.classCount,
+                lsClassCount,
+                counts.lsTotalCount + lsTotalChange,
+                counts.totalCount,
+            )
+        for name, counts in updatedCounts.items():
+            counts.save(os.path.join(self.stateDir, f"{name}.npz"))
+        current[...] = updated
+        self.lsArray.flush()
+        self.counts = updatedCounts
+
+    def save(self):
+        """Writes the inventory and the counts of every factor to stateDir."""
+        self.lsArray.flush()
+        for name, counts in self.counts.items():
+            counts.save(os.path.join(self.stateDir, f"{name}.npz"))
+
+    def getWoE(self, name: str) -> WoE:
+        """Returns the WoE of factor name for the current inventory."""
+        return WoE.fromPartialCounts(self.counts[name])
+
+    def getFR(self, name: str) -> FR:
+        """Returns the FR of factor name for the current inventory."""
+        return FR.fromPartialCounts(self.counts[name])
@@ -0,0 +1,209 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+# Opt-in timing and memory instrumentation of the pipeline stages.
+#   instrument.enable()
+#   ... run WoE, reclassify, ...
+#   print(instrument.getSummary())
+#   instrument.writeTrace("trace.json")
+# While disabled (the default) a stage only costs one function call.
+# Stages of different threads (e.g. the loader) are nested per thread. tracemalloc
+# only has one process wide peak, so stages overlapping a stage of another thread
+# get no peakBytes.
+
+enabled = False
+traceMemory = False
+startedTracing = False  # tracemalloc was started by enable
+records = []  # one dict per finished stage, see stage
+callbacks = []  # called with each record when a stage finishes
+threadStages = threading.local()  # .openStages: stack of the running stages of a thread
+runningStages = []  # running stages of all threads
+runningLock = threading.Lock()
+nullStage = contextlib.nullcontext()
+
+
+def enable(memory=True):
+    """Starts recording stages. With memory the peak allocated bytes of each stage are traced with
+    tracemalloc, which slows down allocations.
+    """
+    global enabled, traceMemory, startedTracing
+    enabled = True
+    traceMemory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        startedTracing = True
+
+
+def disable():
+    """Stops recording stages. Recorded stages are kept until reset."""
+    global enabled, traceMemory, startedTracing
+    enabled = False
+    if startedTracing:
+        tracemalloc.stop()
+    traceMemory = False
+    startedTracing = False
+
+
+def reset():
+    """Deletes all recorded stages."""
+    records.clear()
+
+
+def addCallback(callback):
+    """Registers callback(record), called each time a stage finishes."""
+    callbacks.append(callback)
+
+
+def stage(name: str, **arrays):
+    """Returns a context manager recording the stage name while enabled: wall time, CPU time, peak
+    allocated bytes (relative to the start of the stage) and the shape, type and bytes of the
+    arrays passed as keywords. Stages can be nested, each record knows its parent (in its own
+    thread). Stages overlapping a stage of another thread get no peakBytes.
+    """
+    if not enabled:
+        return nullStage
+    return recordStage(name, arrays)
+
+
+def getOpenStages() -> list:
+    """Returns the stack of the running stages of the current thread."""
+    if not hasattr(threadStages, "openStages"):
+        threadStages.openStages = []
+    return threadStages.openStages
+
+
+@contextlib.contextmanager
+def recordStage(name: str, arrays: dict):
+    openStages = getOpenStages()
+    record = {
+        "name": name,
+        "parent": openStages[-1]["name"] if openStages else None,
+        "thread": threading.current_thread().name,
+        "start": time.time(),
+        "arrays": {key: getArrayInfo(array) for key, array in arrays.items()},
+    }
+    with runningLock:
+        for running in runningStages:
+            if running["thread"] != record["thread"]:
+                # the peak is shared, neither stage can tell its own
+                running["concurrent"] = record["concurrent"] = True
+        runningStages.append(record)
+    if traceMemory:
+        startBytes, peakBytes = tracemalloc.get_traced_memory()
+        if openStages:  # keep the peak of the parent before resetting it
+            openStages[-1]["peak"] = max(openStages[-1]["peak"], peakBytes)
+        tracemalloc.reset_peak()
+        record["peak"] = startBytes
+    openStages.append(record)
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wallSeconds"] = time.perf_counter() - wallStart
+        record["cpuSeconds"] = time.process_time() - cpuStart
+        openStages.pop()
+        with runningLock:
+            runningStages.remove(record)
+        concurrent = record.pop("concurrent", False)
+        if traceMemory:
+            peakBytes = max(record.pop("peak"), tracemalloc.get_traced_memory()[1])
+            if not concurrent:
+                record["peakBytes"] = peakBytes - startBytes
+            if openStages:
+                openStages[-1]["peak"] = max(openStages[-1]["peak"], peakBytes)
+                if concurrent:
+                    openStages[-1]["concurrent"] = True
+        records.append(record)
+        for callback in callbacks:
+            callback(record)
+
+
+def getArrayInfo(array) -> dict:
+    """Returns the shape, type and bytes of array (anything with shape / dtype / nbytes). A list
+    of arrays gets the shape (count, *shape of the first array) and the bytes of all arrays.
+    """
+    if isinstance(array, list) and array:
+        info = getArrayInfo(array[0])
+        info["shape"] = [len(array), *info["shape"]]
+        info["bytes"] = sum(getArrayInfo(item)["bytes"] for item in array)
+        return info
+    return {
+        "shape": list(getattr(array, "shape", ())),
+        "dtype": str(getattr(array, "dtype", type(array).__name__)),
+        "bytes": int(getattr(array, "nbytes", 0)),
+    }
+
+
+def instrumented(name: str):
+    """Decorator recording every call of the decorated function as stage name, with the sizes of
+    the array arguments (by parameter name) and of the returned array(s) as "return".
+    """
+
+    def decorator(function):
+        parameterNames = function.__code__.co_varnames[: function.__code__.co_argcount]
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            arrays = {
+                key: value
+                for key, value in [*zip(parameterNames, args), *kwargs.items()]
+                if isArrayLike(value)
+            }
+            with recordStage(name, arrays) as record:
+                result = function(*args, **kwargs)
+                if isArrayLike(result):
+                    record["arrays"]["return"] = getArrayInfo(result)
+                elif isinstance(result, (tuple, list)):
+                    record["arrays"].update(
+                        (f"return{i}", getArrayInfo(value))
+                        for i, value in enumerate(result)
+                        if isArrayLike(value)
+                    )
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def isArrayLike(value) -> bool:
+    """Returns True for arrays (anything with shape and dtype) and lists of arrays."""
+    if isinstance(value, list):
+        return len(value) > 0 and all(isArrayLike(item) for item in value)
+    return hasattr(value, "shape") and hasattr(value, "dtype")
+
+
+def getSummary() -> str:
+    """Returns a table with calls, total wall and CPU seconds and the largest peak of each stage."""
+    stages = {}
+    for record in records:
+        summary = stages.setdefault(
+            record["name"], {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak": None}
+        )
+        summary["calls"] += 1
+        summary["wall"] += record["wallSeconds"]
+        summary["cpu"] += record["cpuSeconds"]
+        if "peakBytes" in record:
+            summary["peak"] = max(summary["peak"] or 0, record["peakBytes"])
+    lines = [f"{'stage':<30}{'calls':>7}{'wall s':>11}{'cpu s':>11}{'peak MiB':>11}"]
+    for name, summary in stages.items():
+        peak = "-" if summary["peak"] is None else f"{summary['peak'] / 2**20:.1f}"
+        lines.append(
+            f"{name:<30}{summary['calls']:>7}{summary['wall']:>11.4f}"
+            f"{summary['cpu']:>11.4f}{peak:>11}"
+        )
+    return "\n".join(lines)
+
+
+def writeTrace(path: str) -> str:
+    """Writes all records as JSON to path and returns path."""
+    with open(path, "w") as traceFile:
+        json.dump({"records": records}, traceFile, indent=2)
+    return path
@@ -0,0 +1,76 @@
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Loads the inputs of a job (factor rasters, landslide inventories) concurrently.
+# GDAL releases the GIL while reading and decompressing, so the reads overlap and
+# the start-up takes about as long as the slowest read instead of all reads.
+
+
+def readManifest(manifestPath: str) -> dict:
+    """Returns the manifest (see Loader) stored as JSON at manifestPath."""
+    with open(manifestPath) as manifestFile:
+        return json.load(manifestFile)
+
+
+def loadEntry(entry: dict):
+    """Returns the array of one manifest entry: vector2Array(**entry) if the entry has a
+    vectorPath, else raster2Array(**entry).
+    """
+    from .toArray import raster2Array, vector2Array
+
+    if "vectorPath" in entry:
+        return vector2Array(**entry)
+    return raster2Array(**entry)
+
+
+class Loader:
+    """Starts loading every entry of manifest in a pool of workers threads on creation.
+    manifest maps a name to the keyword arguments of raster2Array or vector2Array, e.g.
+    {"geology": {"rasterPath": "geology.tif"},
+     "terrain": {"rasterPath": "terrain.tif", "bandNr": [1, 2, 3]},
+     "landslides": {"vectorPath": "ls.shp", "maskRasterPath": "geology.tif", "burnField": "id"}}
+    or a path to such a manifest as JSON. Get the arrays with loader[name] (waits for that entry
+    only), asCompleted (in the order they finish, to start computing on the first ready one) or
+    results (all). Use it as context manager or call close to end the pool.
+    """
+
+    def __init__(self, manifest, workers=4):
+        if isinstance(manifest, str):
+            manifest = readManifest(manifest)
+        self.manifest = manifest
+        self.pool = ThreadPoolExecutor(workers)
+        self.futures = {
+            name: self.pool.submit(loadEntry, entry) for name, entry in manifest.items()
+        }
+
+    def __enter__(self) -> "Loader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getitem__(self, name: str):
+        """Returns the array of name, waits until it is loaded."""
+        return self.futures[name].result()
+
+    def asCompleted(self):
+        """Yields (name, array) for each entry as soon as it is loaded."""
+        names = {future: name for name, future in self.futures.items()}
+        for future in as_completed(names):
+            yield names[future], future.result()
+
+    def results(self) -> dict:
+        """Returns a dict with the array of every entry, waits until all are loaded."""
+        return {name: future.result() for name, future in self.futures.items()}
+
+    def close(self):
+        """Cancels the entries that did not start yet and ends the pool."""
+        self.pool.shutdown(cancel_futures=True)
+
+
+def loadManifest(manifest, workers=4) -> dict:
+    """Returns a dict with the array of every entry of manifest (see Loader), loaded concurrently
+    in a pool of workers threads.
+    """
+    with Loader(manifest, workers) as loader:
+        return loader.results()
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+
+# GDAL free storage of rasters as .npy (one band or a band stack) or .npz files
+# (band1, band2, ... plus optional noData, geoTransform and projection).
+# raster2Array, readWindow, getRasterSize and array2Raster use it for these extensions.
+
+npyExtensions = (".npy", ".npz")
+
+
+def isNpyPath(path: str) -> bool:
+    """Returns True if path is a .npy or .npz file."""
+    return os.path.splitext(path)[1].lower() in npyExtensions
+
+
+def npy2Array(path: str, bandNr=1) -> np.ndarray:
+    """Returns band bandNr of the .npy or .npz file at path. A .npy file is memory-mapped
+    copy-on-write, a 3D .npy holds the bands along the first axis.
+    """
+    if path.lower().endswith(".npz"):
+        with np.load(path) as npz:
+            return npz[f"band{bandNr}"]
+    array = np.load(path, mmap_mode="c")
+    if array.ndim == 3:
+        return array[bandNr - 1]
+    if bandNr != 1:
+        raise ValueError(f"{path} has only one band")
+    return array
+
+
+def array2Npy(
+    array: np.ndarray, path: str, noData=None, geoTransform=None, projection=None
+) -> str:
+    """Returns path, writes array (2D, or 3D with one band per entry of the first axis) to the
+    .npy or .npz file at path. noData, geoTransform and projection are only kept in a .npz.
+    """
+    if not path.lower().endswith(".npz"):
+        np.save(path, array)
+        return path
+    bands = array if np.ndim(array) == 3 else [array]
+    info = {
+        key: value
+        for key, value in (
+            ("noData", noData),
+            ("geoTransform", geoTransform),
+            ("projection", projection),
+        )
+        if value is not None
+    }
+    np.savez(path, **{f"band{i + 1}": band for i, band in enumerate(bands)}, **info)
+    return path
+
+
+def getNpyInfo(path: str) -> dict:
+    """Returns the noData, geoTransform and projection stored in the .npz file at path (None if
+    missing or for a .npy file).
+    """
+    info = dict.fromkeys(("noData", "geoTransform", "projection"))
+    if path.lower().endswith(".npz"):
+        with np.load(path) as npz:
+            for key in info:
+                if key in npz:
+                    info[key] = npz[key].tolist()
+    return info
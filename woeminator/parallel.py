@@ -0,0 +1,140 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .randomize import getRandomMemberships
+from .sharedCalcFunctions import PartialCounts, getClassValues
+from .woe import WoE
+
+# Runs WoE / FR subsamples (and factors) in a process pool. The rasters are put
+# into shared memory once, workers attach to them without copying and only send
+# back the small resultsTables.
+# runSharded splits raster files into tiles instead, each worker reads and counts
+# its own tiles (like nodes of a cluster) and only the PartialCounts are merged.
+
+# Arrays attached by attachSharedArrays in a worker process, with their SharedMemory.
+sharedArrays = {}
+
+
+def shareArray(array: np.ndarray) -> tuple:
+    """Returns a tuple (sharedMemory, spec) with a copy of array in a new SharedMemory block.
+    spec = (name, shape, dtype) is what a worker needs to attach to it (see attachArray).
+    The caller has to close and unlink sharedMemory when done.
+    """
+    sharedMemory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=sharedMemory.buf)[...] = array
+    return sharedMemory, (sharedMemory.name, array.shape, array.dtype.str)
+
+
+def attachArray(spec: tuple) -> tuple:
+    """Returns a tuple (sharedMemory, array) with array being a view of the SharedMemory block
+    described by spec (see shareArray).
+    """
+    name, shape, dtype = spec
+    sharedMemory = shared_memory.SharedMemory(name=name)
+    return sharedMemory, np.ndarray(shape, dtype, buffer=sharedMemory.buf)
+
+
+def attachSharedArrays(factorSpecs: list, lsSpec: tuple):
+    """Initializer of the worker processes, attaches the factor rasters and the landslides."""
+    sharedArrays["factors"] = [attachArray(spec) for spec in factorSpecs]
+    sharedArrays["landslides"] = attachArray(lsSpec)
+
+
+def runSubsample(method, factorIndex: int, trainIds: np.ndarray, noData) -> np.ndarray:
+    """Returns the resultsTable of method (WoE or FR) for the factor raster factorIndex and the
+    landslides with an ID in trainIds. Runs in a worker process.
+    """
+    _, rasterArray = sharedArrays["factors"][factorIndex]
+    _, lsArray = sharedArrays["landslides"]
+    trainArray = np.isin(lsArray, trainIds).view(np.int8)  # 1 = training landslide
+    return method(rasterArray, trainArray, noData).resultsTable
+
+
+def runParallel(
+    rasterArrays: list,
+    lsArray: np.ndarray,
+    count: int,
+    percent=80,
+    seed=42,
+    noData=-9999,
+    method=WoE,
+    workers=None,
+) -> list:
+    """Returns a list with one list of count resultsTables for each raster in rasterArrays.
+    Expects lsArray to hold an individual ID for each landslide (see vector2Array), 0 means no
+    landslide. Every subsample with percent % of the landslides is calculated with method (WoE
+    or FR) in a pool of workers processes (default: one per CPU).
+    The subsamples are drawn up front (see getRandomMemberships), so the results only depend on
+    seed and not on the amount of workers.
+    """
+    lsIds = getClassValues(lsArray, noData)
+    lsIds = lsIds[lsIds != 0]
+    memberships = getRandomMemberships(lsIds, count, percent, seed)
+    sharedMemories = []
+    try:
+        factorSpecs = []
+        for rasterArray in rasterArrays:
+            sharedMemory, spec = shareArray(np.asarray(rasterArray))
+            sharedMemories.append(sharedMemory)
+            factorSpecs.append(spec)
+        sharedMemory, lsSpec = shareArray(lsArray)
+        sharedMemories.append(sharedMemory)
+        with ProcessPoolExecutor(
+            workers, initializer=attachSharedArrays, initargs=(factorSpecs, lsSpec)
+        ) as pool:
+            futures = [
+                [
+                    pool.submit(runSubsample, method, i, lsIds[membership], noData)
+                    for membership in memberships
+                ]
+                for i in range(len(factorSpecs))
+            ]
+            return [[future.result() for future in factor] for factor in futures]
+    finally:
+        for sharedMemory in sharedMemories:
+            sharedMemory.close()
+            sharedMemory.unlink()
+
+
+def countTile(
+    rasterPath: str, lsRasterPath: str, window: tuple, noData, bandNr: int
+) -> PartialCounts:
+    """Returns the PartialCounts of window (xOff, yOff, xSize, ySize) of the raster and the
+    landslide raster. Runs in a worker process.
+    """
+    from .toArray import readWindow
+
+    return PartialCounts.fromArrays(
+        readWindow(rasterPath, window, bandNr), readWindow(lsRasterPath, window), noData
+    )
+
+
+def runSharded(
+    rasterPath: str,
+    lsRasterPath: str,
+    noData=-9999,
+    bandNr=1,
+    tileSize=1024,
+    workers=None,
+) -> PartialCounts:
+    """Returns the PartialCounts of the raster at rasterPath (band bandNr) and the landslide
+    raster at lsRasterPath (1 = landslide). The rasters are split into tiles of tileSize x
+    tileSize pixels, each counted in a pool of workers processes (default: one per CPU) that
+    reads only its tile, then the PartialCounts are added up.
+    Pass the result to WoE.fromPartialCounts or FR.fromPartialCounts, the resultsTable is
+    identical to the one of a single process.
+    """
+    from .toArray import getRasterSize, getWindows
+
+    xRes, yRes = getRasterSize(rasterPath)
+    windows = getWindows(xRes, yRes, tileSize, tileSize, 1, tileSize * tileSize)
+    with ProcessPoolExecutor(workers) as pool:
+        partialCounts = pool.map(
+            countTile,
+            [rasterPath] * len(windows),
+            [lsRasterPath] * len(windows),
+            windows,
+            [noData] * len(windows),
+            [bandNr] * len(windows),
+        )
+        return sum(partialCounts)
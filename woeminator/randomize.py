@@ -0,0 +1,119 @@
+import numpy as np
+from .instrument import instrumented
+
+
+@instrumented("getRandomArrays")
+def getRandomArrays(
+    inputArray: np.ndarray, count: int, percent=80, seed=42, noData=-9999
+) -> tuple:
+    """Returns a tuple of two lists:
+    1. List of count Numpy Arrays with each a percent of inputArray (Training).
+    2. List of count Numpy Arrays with each 100-percent of inputArray (Validation).
+    Expects inputArray to be a Numpy array with 1 to n each indicating an individual landslide.
+    0 means no landslide and noData no value.
+    Every array is a full copy of inputArray, use SubsampleSet directly to create them lazily.
+    """
+    subsamples = SubsampleSet(inputArray, count, percent, seed, noData)
+    return ([*subsamples.trainArrays()], [*subsamples.valArrays()])
+
+
+class SubsampleSet:
+    """Compact set of count random training / validation subsamples of inputArray.
+    Expects inputArray to be a Numpy array with 1 to n each indicating an individual landslide.
+    0 means no landslide and noData no value.
+    The landslide pixels are stored once as flat indices with the index of their ID in lsIds, each
+    subsample only as a bit-packed membership vector over lsIds. Memory scales with landslide
+    pixels + count * landslides, a raster is only created when asked for (getTrainArray,
+    getValArray or iterating). Uses the same draws as getRandomMemberships.
+    inputArray is not copied, do not modify it while the SubsampleSet is in use.
+    """
+
+    def __init__(
+        self, inputArray: np.ndarray, count: int, percent=80, seed=42, noData=-9999
+    ):
+        self.inputArray = inputArray
+        self.flatIndices = np.flatnonzero((inputArray != noData) & (inputArray != 0))
+        self.lsIds, idIndices = np.unique(
+            inputArray.flat[self.flatIndices], return_inverse=True
+        )
+        self.idIndices = idIndices.ravel().astype(np.min_scalar_type(len(self.lsIds)))
+        self.packedMemberships = np.packbits(
+            getRandomMemberships(self.lsIds, count, percent, seed), axis=1
+        )
+
+    def __len__(self) -> int:
+        return len(self.packedMemberships)
+
+    def __iter__(self):
+        """Yields a (training, validation) tuple of arrays for each subsample."""
+        for i in range(len(self)):
+            yield (self.getTrainArray(i), self.getValArray(i))
+
+    @property
+    def memberships(self) -> np.ndarray:
+        """Returns a boolean Numpy array (count x len(lsIds)), True for training landslides."""
+        return np.unpackbits(
+            self.packedMemberships, axis=1, count=len(self.lsIds)
+        ).astype(bool)
+
+    def getMembership(self, i: int) -> np.ndarray:
+        """Returns a boolean Numpy array, True for each of lsIds in the i. training subsample."""
+        return np.unpackbits(self.packedMemberships[i], count=len(self.lsIds)).astype(
+            bool
+        )
+
+    def getTrainArray(self, i: int) -> np.ndarray:
+        """Returns a copy of inputArray with the landslides of the i. validation subsample
+        replaced with 0.
+        """
+        return self.getSubsampleArray(self.getMembership(i))
+
+    def getValArray(self, i: int) -> np.ndarray:
+        """Returns a copy of inputArray with the landslides of the i. training subsample
+        replaced with 0.
+        """
+        return self.getSubsampleArray(~self.getMembership(i))
+
+    def getSubsampleArray(self, membership: np.ndarray) -> np.ndarray:
+        """Returns a copy of inputArray keeping only the landslides marked True in membership."""
+        subsampleArray = self.inputArray.copy()
+        subsampleArray.flat[self.flatIndices[~membership[self.idIndices]]] = 0
+        return subsampleArray
+
+    def trainArrays(self):
+        """Yields the training array of each subsample."""
+        for i in range(len(self)):
+            yield self.getTrainArray(i)
+
+    def valArrays(self):
+        """Yields the validation array of each subsample."""
+        for i in range(len(self)):
+            yield self.getValArray(i)
+
+
+def getRandomMemberships(
+    values: np.ndarray, count: int, percent=80, seed=42
+) -> np.ndarray:
+    """Returns a boolean Numpy array (count x len(values)). Row i is True for every value in the
+    i. training subsample, False for values in the i. validation subsample.
+    Draws the same subsamples as getRandomArrays for the same values, percent and seed.
+    """
+    lsCountInTrainArray = int(round(len(values) / 100 * percent))
+    memberships = np.zeros((count, len(values)), dtype=bool)
+    np.random.seed(seed)
+    for i in range(count):
+        memberships[
+            i, np.random.choice(len(values), size=lsCountInTrainArray, replace=False)
+        ] = True
+    return memberships
+
+
+if __name__ == "__main__":
+    import timeit
+
+    x = timeit.timeit(
+        "getRandomArrays(np.arange(815262).reshape(826, 987), 100, noData=899)",
+        globals=globals(),
+        number=1,
+    )
+    print(x)
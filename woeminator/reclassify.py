@@ -0,0 +1,93 @@
+import numpy as np
+from .factorized import FactorizedRaster
+from .instrument import instrumented
+
+# One pass reclassification of class values, e.g. a WoE resultsTable to a weights raster.
+
+
+def getReclassIndices(inputArray: np.ndarray, classValues, noData=None) -> np.ndarray:
+    """Returns an array of the shape of inputArray with the index into classValues for every
+    element. Elements not in classValues get len(classValues), noData gets len(classValues) + 1.
+    Uses a dense lookup table if inputArray is integer and classValues are integers in a small
+    range, else a binary search (searchsorted) over the sorted classValues.
+    For a FactorizedRaster only its class values are looked up, its noData is used as noData.
+    """
+    classValues = np.asarray(classValues)
+    classCount = len(classValues)
+    if isinstance(inputArray, FactorizedRaster):
+        codeIndices = np.append(
+            getReclassIndices(inputArray.classValues, classValues),
+            classCount + 1,  # noDataCode
+        )
+        return codeIndices[inputArray.codes]
+    indexType = np.min_scalar_type(classCount + 1)
+    if classCount == 0:
+        indices = np.zeros(np.shape(inputArray), dtype=indexType)
+    elif (
+        np.issubdtype(inputArray.dtype, np.integer)
+        and np.all(classValues == np.round(classValues))
+        and np.ptp(classValues) < max(inputArray.size, 2**16)
+    ):
+        minValue = int(classValues.min())
+        span = int(classValues.max()) - minValue + 1
+        lut = np.full(span + 1, classCount, dtype=indexType)  # last entry = not found
+        lut[classValues.astype(np.int64) - minValue] = np.arange(classCount)
+        offsets = inputArray.astype(np.intp) - minValue
+        offsets[(offsets < 0) | (offsets >= span)] = span
+        indices = lut[offsets]
+    else:
+        order = np.argsort(classValues, kind="stable")
+        sortedValues = classValues[order]
+        positions = np.searchsorted(sortedValues, inputArray).clip(max=classCount - 1)
+        indices = np.where(
+            sortedValues[positions] == inputArray, order[positions], classCount
+        ).astype(indexType)
+    if noData is not None:
+        indices[inputArray == noData] = classCount + 1
+    return indices
+
+
+@instrumented("reclassify")
+def reclassify(
+    inputArray: np.ndarray,
+    classValues,
+    replacement,
+    default=None,
+    noData=None,
+    noDataReplacement=None,
+    out=None,
+    dtype=None,
+) -> np.ndarray:
+    """Returns an array where each element of inputArray found in classValues is replaced with the
+    value of replacement with the same index, in one pass over inputArray.
+    Elements not in classValues get default, or keep their value if default is None.
+    If noData is given its elements get noDataReplacement, or keep their value if that is None.
+    The result is written into out if given (out may be inputArray to work in place), else into
+    a new array of dtype (default: the type of replacement).
+    inputArray may also be a FactorizedRaster, then its classes are looked up only once.
+    """
+    replacement = np.asarray(replacement)
+    if out is None:
+        out = np.empty(
+            np.shape(inputArray), dtype=replacement.dtype if dtype is None else dtype
+        )
+    classCount = len(replacement)
+    indices = getReclassIndices(inputArray, classValues, noData)
+    table = np.zeros(classCount + 2, dtype=out.dtype)
+    table[:classCount] = replacement
+    keep = []  # indices of elements that keep their value
+    for index, value in ((classCount, default), (classCount + 1, noDataReplacement)):
+        if value is None:
+            keep.append(index)
+        else:
+            table[index] = value
+    if keep:
+        keepMask = np.isin(indices, keep)
+        if isinstance(inputArray, FactorizedRaster):
+            inputArray = inputArray.toArray()
+        if out is not inputArray:
+            np.copyto(out, inputArray, casting="unsafe", where=keepMask)
+        np.copyto(out, table[indices], where=~keepMask)
+    else:
+        np.take(table, indices, out=out)
+    return out
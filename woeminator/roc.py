@@ -0,0 +1,126 @@
+import numpy as np
+from .randomize import SubsampleSet
+from .reclassify import getReclassIndices
+from .sharedCalcFunctions import factorizeArray, getSubsampleCounts
+
+# ROC / rate curves of a susceptibility raster. A WoE or FR map only has as many
+# distinct scores as classes, so everything works on per score counts instead of
+# a per pixel sort.
+
+
+def getScoreCodes(
+    scoreArray, noData=-9999, resultsTable=None, column="classWeight"
+) -> tuple:
+    """Returns a tuple (scores, codes) with the sorted distinct scores and the index into scores
+    of every pixel, len(scores) for noData.
+    With resultsTable scoreArray is the class raster (or a FactorizedRaster) the resultsTable was
+    calculated from and the score of a class is resultsTable[column]. The classes are looked up
+    with getReclassIndices (lookup table or binary search) and only the scores of the classes are
+    sorted, classes missing in resultsTable count as noData.
+    Without resultsTable scoreArray is the score raster itself, a float raster then has to be
+    factorized with np.unique, which sorts all pixels.
+    """
+    if resultsTable is None:
+        return factorizeArray(scoreArray, noData)
+    scores, scoreIndices = np.unique(resultsTable[column], return_inverse=True)
+    # class index -> score index, not found and noData -> len(scores)
+    classCodes = np.append(scoreIndices.ravel(), [len(scores), len(scores)])
+    classCodes = classCodes.astype(np.min_scalar_type(len(scores)))
+    return (
+        scores,
+        classCodes[getReclassIndices(scoreArray, resultsTable["classValue"], noData)],
+    )
+
+
+def getScoreCounts(
+    scoreArray,
+    lsArrays,
+    noData=-9999,
+    training=False,
+    resultsTable=None,
+    column="classWeight",
+) -> tuple:
+    """Returns a tuple (lsCounts, pixelCounts), one row per landslide array and one column per
+    distinct score in scoreArray, ordered from the highest to the lowest score.
+    lsCounts holds the landslide pixels per score, pixelCounts all pixels per score. Pixels that
+    are noData in scoreArray or in the landslide array are left out.
+    lsArrays is a single array, a list or stack of arrays (e.g. the validation arrays of
+    getRandomArrays) or a SubsampleSet. A SubsampleSet is evaluated for all subsamples at once, its
+    validation subsamples by default or its training subsamples if training is True.
+    Pass the class raster with its resultsTable (and column) instead of a float weights raster
+    to avoid sorting the pixels (see getScoreCodes).
+    """
+    scores, codes = getScoreCodes(scoreArray, noData, resultsTable, column)
+    binCount = len(scores) + 1  # last bin = noData
+    if isinstance(lsArrays, SubsampleSet):
+        domain = lsArrays.inputArray != noData
+        pixelCounts = np.bincount(codes[domain], minlength=binCount)[:-1]
+        lsIdScoreCount = np.bincount(
+            lsArrays.idIndices.astype(np.intp) * binCount
+            + codes.flat[lsArrays.flatIndices],
+            minlength=len(lsArrays.lsIds) * binCount,
+        ).reshape(len(lsArrays.lsIds), binCount)
+        memberships = lsArrays.memberships
+        lsCounts, _ = getSubsampleCounts(
+            lsIdScoreCount, memberships if training else ~memberships
+        )
+        pixelCounts = np.broadcast_to(pixelCounts, lsCounts.shape)
+    else:
+        if isinstance(lsArrays, np.ndarray) and lsArrays.ndim == 2:
+            lsArrays = [lsArrays]
+        lsCounts = []
+        pixelCounts = []
+        for lsArray in lsArrays:
+            domain = lsArray != noData
+            pixelCounts.append(np.bincount(codes[domain], minlength=binCount)[:-1])
+            lsCounts.append(
+                np.bincount(codes[domain & (lsArray != 0)], minlength=binCount)[:-1]
+            )
+        lsCounts = np.array(lsCounts)
+        pixelCounts = np.array(pixelCounts)
+    return lsCounts[:, ::-1], pixelCounts[:, ::-1]
+
+
+def getROC(
+    scoreArray,
+    lsArrays,
+    noData=-9999,
+    training=False,
+    xAxis="stable",
+    resultsTable=None,
+    column="classWeight",
+) -> tuple:
+    """Returns a tuple (x, y) of the curve points, one row per landslide array (see
+    getScoreCounts) and one column per threshold, starting at (0, 0).
+    y is the share of landslide pixels with a score >= the threshold. x is the share of stable
+    (non landslide) pixels (xAxis="stable", the ROC curve) or of all pixels (xAxis="area", the
+    success / prediction rate curve) with a score >= the threshold.
+    Use the training arrays for a success rate and the validation arrays for a prediction rate.
+    With resultsTable scoreArray is the class raster and resultsTable[column] the score of each
+    class (see getScoreCodes), which is much faster than a float weights raster.
+    """
+    lsCounts, pixelCounts = getScoreCounts(
+        scoreArray, lsArrays, noData, training, resultsTable, column
+    )
+    if xAxis == "stable":
+        xCounts = pixelCounts - lsCounts
+    elif xAxis == "area":
+        xCounts = pixelCounts
+    else:
+        raise ValueError(f'xAxis has to be "stable" or "area", not {xAxis}')
+    x = getCumulativeShare(xCounts)
+    y = getCumulativeShare(lsCounts)
+    return x, y
+
+
+def getCumulativeShare(counts: np.ndarray) -> np.ndarray:
+    """Returns the cumulative share of counts along the last axis with a leading 0."""
+    cumulative = np.cumsum(counts, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = cumulative / cumulative[..., -1:]
+    return np.concatenate([np.zeros(share.shape[:-1] + (1,)), share], axis=-1)
+
+
+def getAUC(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Returns the area under the curves (x, y) from getROC, one value per row (trapezoidal rule)."""
+    return ((x[..., 1:] - x[..., :-1]) * (y[..., 1:] + y[..., :-1]) / 2).sum(axis=-1)
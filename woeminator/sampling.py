@@ -0,0 +1,164 @@
+import numpy as np
+from .sharedCalcFunctions import mergeClassCounts
+
+# Vectorized random sampling on ranks. Every function draws from a np.random.Generator
+# seeded with seed: for each class the ranks (n-th element of the class in row-major order)
+# of the elements to replace. These are mapped to elements scanning the array in chunks of
+# rows with running counts per class, so apart from the drawn ranks only chunk sized
+# temporaries are allocated. With inPlace=True inputArray itself is modified, otherwise a copy.
+
+chunkElements = 2**16
+
+
+def getChunks(array: np.ndarray) -> list:
+    """Returns views of array, chunks of rows (along the first axis) with about chunkElements
+    elements each.
+    """
+    rowSize = max(1, array[0].size) if array.ndim > 1 else 1
+    rowsPerChunk = max(1, chunkElements // rowSize)
+    return [array[i : i + rowsPerChunk] for i in range(0, len(array), rowsPerChunk)]
+
+
+def getIndexType(size: int) -> type:
+    """Returns np.uint32 if indices below size fit into it, else np.int64."""
+    return np.uint32 if size <= np.iinfo(np.uint32).max else np.int64
+
+
+def drawRanks(counts: np.ndarray, replaceCounts: np.ndarray, rng) -> tuple:
+    """Returns a tuple (ranks, drawKept). For every class c either the replaceCounts[c] ranks
+    to replace or (drawKept[c], if fewer) the ranks to keep are drawn from range(counts[c])
+    without replacement. ranks holds them offset by the sum of the counts of the classes
+    before, so it is sorted and unique over all classes.
+    """
+    drawKept = replaceCounts > counts - replaceCounts
+    drawCounts = np.where(drawKept, counts - replaceCounts, replaceCounts)
+    offsets = np.cumsum(counts) - counts
+    indexType = getIndexType(int(counts.sum()))
+    ranks = np.empty(int(drawCounts.sum()), dtype=indexType)
+    start = 0
+    for count, drawCount, offset in zip(counts, drawCounts, offsets):
+        classRanks = rng.choice(int(count), int(drawCount), replace=False)
+        classRanks.sort()
+        ranks[start : start + drawCount] = classRanks + offset
+        start += drawCount
+    return ranks, drawKept
+
+
+def replaceRanks(
+    array: np.ndarray,
+    getCodes,
+    counts: np.ndarray,
+    replaceCounts: np.ndarray,
+    noData,
+    rng,
+) -> np.ndarray:
+    """Returns array where for every class c replaceCounts[c] of its counts[c] elements, chosen
+    at random, are replaced with noData. getCodes(chunk) returns the class of each element of
+    a chunk of array (len(counts) for elements in no class).
+    """
+    ranks, drawKept = drawRanks(counts, replaceCounts, rng)
+    drawKept = np.append(drawKept, False)
+    offsets = np.cumsum(counts) - counts
+    seen = np.zeros(len(counts) + 1, dtype=np.int64)
+    for chunk in getChunks(array):
+        codes = getCodes(chunk).ravel()
+        indices = np.flatnonzero(codes != len(counts))
+        codes = codes[indices]
+        # rank of every element inside its class: stable sort by class, then count up from
+        # the elements of the class seen in earlier chunks
+        order = np.argsort(codes, kind="stable")
+        chunkCounts = np.bincount(codes, minlength=len(counts) + 1)
+        groupStarts = np.cumsum(chunkCounts) - chunkCounts
+        sortedCodes = codes[order]
+        elementRanks = (
+            np.arange(len(order)) - groupStarts[sortedCodes] + seen[sortedCodes]
+        )
+        elementRanks += offsets[sortedCodes]
+        seen += chunkCounts
+        drawn = np.searchsorted(ranks, elementRanks)
+        isDrawn = drawn < len(ranks)
+        isDrawn[isDrawn] = ranks[drawn[isDrawn]] == elementRanks[isDrawn]
+        replace = isDrawn != drawKept[sortedCodes]
+        chunk.flat[indices[order[replace]]] = noData
+    return array
+
+
+def fillRandomNoDataUntilPercent(
+    inputArray: np.ndarray,
+    landslide=1,
+    noLandslide=0,
+    percent=30,
+    noData=-9999,
+    seed=42,
+    inPlace=False,
+) -> np.ndarray:
+    """Returns inputArray (or a copy) where noLandslide values are randomly replaced with noData
+    until landslide values make up percent % of all landslide and noLandslide elements if the
+    percentage of landslides is too low, else it randomly replaces landslides with noData until
+    percent % of them are landslides.
+    """
+    array = inputArray if inPlace else inputArray.copy()
+    lsCount = 0
+    nonLsCount = 0
+    for chunk in getChunks(array):
+        lsCount += np.count_nonzero(chunk == landslide)
+        nonLsCount += np.count_nonzero(chunk == noLandslide)
+    lsPercent = 100 / (lsCount + nonLsCount) * lsCount
+    percentDifference = percent - lsPercent
+    if percentDifference == 0:  # precision landing
+        return array
+    elif percentDifference < 0:  # too many landslides -> add noData for landslide
+        toReplace = landslide
+        candidateCount = lsCount
+        elementCountToModify = abs(
+            nonLsCount - int(nonLsCount / ((100 - percent) / 100)) + lsCount
+        )
+    else:  # too few landslides  -> add noData for noLandslide
+        toReplace = noLandslide
+        candidateCount = nonLsCount
+        elementCountToModify = abs(
+            lsCount - int(lsCount / (percent / 100)) + nonLsCount
+        )
+    return replaceRanks(
+        array,
+        lambda chunk: (chunk != toReplace).view(np.uint8),
+        np.array([candidateCount]),
+        np.array([elementCountToModify]),
+        noData,
+        np.random.default_rng(seed),
+    )
+
+
+def fillNoDataKeepingValueDistribution(
+    inputArray: np.ndarray, percent=20, noData=-9999, seed=42, inPlace=False
+) -> np.ndarray:
+    """Returns inputArray (or a copy) where only percent % of each value are kept and the rest is
+    replaced with noData, so the percentage distribution of the values stays the same or very
+    close to it. It will keep at least one of each value in inputArray.
+    """
+    array = inputArray if inPlace else inputArray.copy()
+    classValues = np.empty(0, dtype=array.dtype)
+    counts = np.empty((1, 0), dtype=np.int64)
+    for chunk in getChunks(array):
+        chunkValues, chunkCounts = np.unique(chunk[chunk != noData], return_counts=True)
+        classValues, counts = mergeClassCounts(
+            classValues, counts, chunkValues, chunkCounts[np.newaxis]
+        )
+    counts = counts[0]
+    afterCounts = (counts * percent / 100).astype("int")
+    afterCounts[afterCounts == 0] = 1
+    toReplace = counts - afterCounts
+
+    def getCodes(chunk):
+        codes = np.searchsorted(classValues, chunk)
+        codes[chunk == noData] = len(classValues)
+        return codes
+
+    return replaceRanks(
+        array,
+        getCodes,
+        counts,
+        toReplace,
+        noData,
+        np.random.default_rng(seed),
+    )
@@ -0,0 +1,291 @@
+import os
+import numpy as np
+from .classify import classifyArray
+from .factorized import FactorizedRaster, factorizeArray
+from .instrument import stage
+from .randomize import getRandomMemberships
+
+# Basic Functions used by both WoE and FR.
+
+
+def getLandslideTotalCount(lsArray: np.ndarray, noData: int, nols: int) -> int:
+    """Returns the total amount of landslidepixels.
+    Gets called by init
+    Expects everything besides nols and noData to be a landslide pixel.
+    """
+    return ((lsArray != noData) & (lsArray != nols)).sum()
+
+
+def getTotalCount(rasterArray, noData: int) -> int:
+    """Returns the total amount of pixel in raster excluding noData.
+    Gets called by init.
+    """
+    if isinstance(rasterArray, FactorizedRaster):
+        return np.count_nonzero(rasterArray.codes != rasterArray.noDataCode)
+    return np.count_nonzero(rasterArray != noData)
+
+
+def getClassValues(rasterArray: np.ndarray, noData) -> np.ndarray:
+    """Returns a numpy array with unique values in rasterArray, discarding noData"""
+    classValues = np.unique(rasterArray)
+    # we dont care about noData
+    if noData in classValues:
+        classValues = classValues[classValues != noData]
+    return classValues
+
+
+def getClassArray(rasterArray, classValue: float, noData=-9999) -> np.ndarray:
+    """
+    Returns a numpy array based on rasterArray.
+    The return array will have 1 "trueValue" where classValue is present,
+    0 "falseValue" elsewhere and -9999 for noData.
+    """
+    classArray = rasterArray.copy()
+    conditions = [classArray == classValue, classArray == noData]
+    choices = [1, -9999]
+    classArray = np.select(conditions, choices, 0)
+    return classArray
+
+
+def getClassCount(classArray, trueValue=1) -> int:
+    """Returns the amount of pixels in a classArray that are inside the class.
+    Gets called by init.
+    """
+    return np.count_nonzero(classArray == trueValue)
+
+
+def getLandslideClassCount(lsArray, classArray, trueValue=1) -> int:
+    """Returns the amount of pixels with landslide inside the class."""
+    return (np.logical_and(lsArray == 1, classArray == trueValue)).sum()
+
+
+def getClassCounts(rasterArray, lsArray, noData=-9999, landslide=1) -> tuple:
+    """Returns a tuple (classValues, classCount, lsClassCount) for all classes of rasterArray.
+    Replaces the getClassArray / getClassCount / getLandslideClassCount loop with one
+    factorization and two bincounts, so the cost is O(pixels) instead of O(pixels * classes).
+    """
+    classValues, codes = factorizeArray(rasterArray, noData)
+    binCount = len(classValues) + 1  # last bin = noData
+    classCount = np.bincount(codes.ravel(), minlength=binCount)[:-1]
+    lsClassCount = np.bincount(codes[lsArray == landslide], minlength=binCount)[:-1]
+    return classValues, classCount, lsClassCount
+
+
+def getLandslideClassTable(rasterArray, lsArray, noData=-9999, nols=0) -> tuple:
+    """Returns a tuple (classValues, classCount, lsIds, lsIdClassCount).
+    lsIds are the unique landslide IDs in lsArray (everything besides nols and noData).
+    lsIdClassCount[i, j] is the amount of pixels of landslide lsIds[i] inside class classValues[j].
+    Its last column holds the pixels of each landslide where rasterArray is noData, so a row sum
+    is the total size of a landslide (see getLandslideTotalCount).
+    """
+    classValues, codes = factorizeArray(rasterArray, noData)
+    binCount = len(classValues) + 1  # last bin = noData
+    classCount = np.bincount(codes.ravel(), minlength=binCount)[:-1]
+    lsMask = (lsArray != noData) & (lsArray != nols)
+    lsIds, idCodes = np.unique(lsArray[lsMask], return_inverse=True)
+    lsIdClassCount = np.bincount(
+        idCodes.ravel() * binCount + codes[lsMask],
+        minlength=len(lsIds) * binCount,
+    ).reshape(len(lsIds), binCount)
+    return classValues, classCount, lsIds, lsIdClassCount
+
+
+def getSubsampleCounts(lsIdClassCount: np.ndarray, memberships: np.ndarray) -> tuple:
+    """Returns a tuple (lsClassCounts, lsTotalCounts) for every subsample in memberships.
+    memberships is a boolean array (subsamples x landslide IDs), lsIdClassCount comes from
+    getLandslideClassTable. lsClassCounts has one row per subsample and one column per class.
+    """
+    # float64 to use BLAS, the counts stay exact below 2**53 pixels
+    lsCounts = np.rint(
+        memberships.astype(np.float64) @ lsIdClassCount.astype(np.float64)
+    ).astype(np.int64)
+    return lsCounts[:, :-1], lsCounts.sum(axis=1)
+
+
+def getEnsembleResultsTables(
+    method,
+    rasterArray: np.ndarray,
+    lsArray: np.ndarray,
+    count: int,
+    percent=80,
+    seed=42,
+    noData=-9999,
+) -> tuple:
+    """Returns a tuple (lsIds, memberships, resultsTables) for WoEEnsemble and FREnsemble.
+    method is WoE or FR, resultsTables holds one method.fromCounts(...).resultsTable for each of
+    count random training subsamples with percent % of the landslide IDs lsIds.
+    memberships[i, j] is True if lsIds[j] is part of the i. training subsample.
+    """
+    name = f"{method.__name__}Ensemble"
+    with stage(f"{name}.table", rasterArray=rasterArray, lsArray=lsArray):
+        classValues, classCount, lsIds, lsIdClassCount = getLandslideClassTable(
+            rasterArray, lsArray, noData
+        )
+    memberships = getRandomMemberships(lsIds, count, percent, seed)
+    with stage(f"{name}.resultsTables", memberships=memberships):
+        lsClassCounts, lsTotalCounts = getSubsampleCounts(lsIdClassCount, memberships)
+        totalCount = classCount.sum()
+        resultsTables = [
+            method.fromCounts(
+                classValues, classCount, lsClassCount, lsTotalCount, totalCount
+            ).resultsTable
+            for lsClassCount, lsTotalCount in zip(lsClassCounts, lsTotalCounts)
+        ]
+    return lsIds, memberships, resultsTables
+
+
+def mergeClassCounts(
+    classValues: np.ndarray,
+    counts: np.ndarray,
+    otherClassValues: np.ndarray,
+    otherCounts: np.ndarray,
+) -> tuple:
+    """Returns a tuple (classValues, counts) with the counts of both inputs added up per class.
+    counts has one row per statistic (e.g. classCount, lsClassCount) and one column per class.
+    """
+    mergedClassValues = np.union1d(classValues, otherClassValues)
+    mergedCounts = np.zeros((len(counts), len(mergedClassValues)), dtype=np.int64)
+    mergedCounts[:, np.searchsorted(mergedClassValues, classValues)] += counts
+    mergedCounts[:, np.searchsorted(mergedClassValues, otherClassValues)] += otherCounts
+    return mergedClassValues, mergedCounts
+
+
+class PartialCounts:
+    """The additive counts WoE and FR are calculated from, for a raster or a part (window, tile)
+    of it: classValues with classCount and lsClassCount per class, lsTotalCount and totalCount.
+    PartialCounts of different parts are combined with +, which is associative and exact, so the
+    parts can be counted anywhere and in any order. WoE.fromPartialCounts and
+    FR.fromPartialCounts calculate the resultsTable. Save and load them as .npz.
+    """
+
+    def __init__(
+        self,
+        classValues: np.ndarray,
+        classCount: np.ndarray,
+        lsClassCount: np.ndarray,
+        lsTotalCount: int,
+        totalCount: int,
+    ):
+        self.classValues = classValues
+        self.classCount = classCount
+        self.lsClassCount = lsClassCount
+        self.lsTotalCount = lsTotalCount
+        self.totalCount = totalCount
+
+    @classmethod
+    def fromArrays(
+        cls, rasterArray: np.ndarray, lsArray: np.ndarray, noData=-9999
+    ) -> "PartialCounts":
+        """Returns the PartialCounts of rasterArray and lsArray (a window of them or the whole
+        arrays), counted like WoE(rasterArray, lsArray, noData).
+        """
+        classValues, classCount, lsClassCount = getClassCounts(
+            rasterArray, lsArray, noData
+        )
+        return cls(
+            classValues,
+            classCount.astype(np.int64),
+            lsClassCount.astype(np.int64),
+            int(getLandslideTotalCount(lsArray, noData, 0)),
+            int(getTotalCount(rasterArray, noData)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PartialCounts":
+        """Returns the PartialCounts saved at path (see save)."""
+        with np.load(path) as npz:
+            return cls(
+                npz["classValues"],
+                npz["classCount"],
+                npz["lsClassCount"],
+                int(npz["lsTotalCount"]),
+                int(npz["totalCount"]),
+            )
+
+    def save(self, path: str) -> str:
+        """Saves the counts as .npz at path and returns path. The file is replaced atomically,
+        a crash leaves either the old or the new counts.
+        """
+        tmpPath = f"{path}.{os.getpid()}.tmp"
+        with open(tmpPath, "wb") as tmpFile:
+            np.savez(
+                tmpFile,
+                classValues=self.classValues,
+                classCount=self.classCount,
+                lsClassCount=self.lsClassCount,
+                lsTotalCount=self.lsTotalCount,
+                totalCount=self.totalCount,
+            )
+        os.replace(tmpPath, path)
+        return path
+
+    def __add__(self, other: "PartialCounts") -> "PartialCounts":
+        if not len(other.classValues):  # keeps the type of the class values
+            classValues, counts = self.classValues, self.getCounts()
+        elif not len(self.classValues):
+            classValues, counts = other.classValues, other.getCounts()
+        else:
+            classValues, counts = mergeClassCounts(
+                self.classValues, self.getCounts(), other.classValues, other.getCounts()
+            )
+        return PartialCounts(
+            classValues,
+            counts[0],
+            counts[1],
+            self.lsTotalCount + other.lsTotalCount,
+            self.totalCount + other.totalCount,
+        )
+
+    def __radd__(self, other):
+        if other == 0:  # start value of sum()
+            return self
+        return NotImplemented
+
+    def getCounts(self) -> np.ndarray:
+        """Returns classCount and lsClassCount stacked (see mergeClassCounts)."""
+        return np.stack([self.classCount, self.lsClassCount])
+
+
+def getBlockClassCounts(blocks, noData=-9999) -> PartialCounts:
+    """Returns the PartialCounts of a raster accumulated block by block.
+    blocks is an iterable of (rasterBlock, lsBlock) pairs covering the raster, e.g. the windows of
+    toArray.iterRasterBlocks. Only one block is held in memory at a time.
+    """
+    return sum(
+        (
+            PartialCounts.fromArrays(rasterBlock, lsBlock, noData)
+            for rasterBlock, lsBlock in blocks
+        ),
+        PartialCounts(np.array([]), np.zeros(0, np.int64), np.zeros(0, np.int64), 0, 0),
+    )
+
+
+def getRasterFileCounts(
+    rasterPath: str,
+    lsRasterPath: str,
+    noData=-9999,
+    bandNr=1,
+    windowBudget=2**26,
+    breaks=None,
+) -> PartialCounts:
+    """Returns the PartialCounts of the raster at rasterPath (band bandNr) and the landslide
+    raster at lsRasterPath, accumulated window by window (see getBlockClassCounts). Each window of
+    both rasters needs at most windowBudget bytes (see toArray.iterRasterBlocks). With breaks
+    (see classify.getBreaks) each raster window is classified with classify.classifyArray first.
+    """
+    from .toArray import iterRasterBlocks
+
+    blocks = (
+        (
+            (
+                rasterBlock
+                if breaks is None
+                else classifyArray(rasterBlock, breaks, noData)
+            ),
+            lsBlock,
+        )
+        for _, _, (rasterBlock, lsBlock) in iterRasterBlocks(
+            [rasterPath, lsRasterPath], [bandNr, 1], windowBudget
+        )
+    )
+    return getBlockClassCounts(blocks, noData)
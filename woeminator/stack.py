@@ -0,0 +1,215 @@
+import os
+import numpy as np
+from .factorized import factorizeArray
+from .instrument import stage
+from .woe import WoE
+
+# WoE / FR of several factor rasters on the same grid in one sweep, combined into
+# unique condition units (pixels with the same class in every factor).
+
+
+def combineCodes(codeArrays: list, radices: list) -> tuple:
+    """Returns a tuple (units, unitCodes) combining the class codes of several factors.
+    radices[i] is the number of codes of codeArrays[i] (classes + noData, see factorizeArray).
+    units holds one row per unique combination present with the code of each factor,
+    unitCodes has the shape of the code arrays and holds the row in units of every pixel.
+    The codes are combined into one integer (mixed radix), which is factorized again whenever the
+    next factor would not fit into int64 anymore.
+    """
+    combined = np.zeros(np.shape(codeArrays[0]), dtype=np.int64)
+    combinedRadix = 1
+    for codes, radix in zip(codeArrays, radices):
+        if combinedRadix * radix >= 2**63:
+            combinedValues, inverse = np.unique(combined, return_inverse=True)
+            combined = inverse.reshape(combined.shape).astype(np.int64)
+            combinedRadix = len(combinedValues)
+        combined *= radix
+        combined += codes
+        combinedRadix *= radix
+    unitValues, firstIndices, unitCodes = np.unique(
+        combined, return_index=True, return_inverse=True
+    )
+    units = np.stack([np.ravel(codes)[firstIndices] for codes in codeArrays], axis=1)
+    unitCodes = unitCodes.reshape(combined.shape).astype(
+        np.min_scalar_type(len(unitValues))
+    )
+    return units, unitCodes
+
+
+# columns of the unit table besides the factor names (see FactorStack.getUnitTable)
+unitColumns = ("unitCount", "lsUnitCount", "weightSum", "posteriorProbability")
+
+
+def getUniqueNames(names: list) -> list:
+    """Returns names with the position (starting at 1) appended to every name that is already
+    taken by an earlier name or by a column of the unit table.
+    """
+    uniqueNames = []
+    for i, name in enumerate(names):
+        if name in uniqueNames or name in unitColumns:
+            name = f"{name}_{i + 1}"
+        while name in uniqueNames or name in unitColumns:
+            name += "_"
+        uniqueNames.append(name)
+    return uniqueNames
+
+
+class FactorStack:
+    """After calling FactorStack(rasterArrays, landslides, noData) FactorStack.resultsTables
+    contains the resultsTable of method (WoE or FR) for each raster in rasterArrays, a list of
+    rasters or a 3D array (factor, row, column) like raster2Array(path, [1, 2, ...]).
+    Expects landslides to be 0 for no landslide, everything else besides noData is a landslide
+    (1 or an individual ID per landslide), so the landslide mask and lsTotalCount are calculated
+    once for all factors. Each factor is factorized once, the resultsTables match
+    method(raster, readyArray4calc(landslides), noData).
+    getUnitTable combines the factors into unique condition units and getWeightSumArray returns
+    the summed classWeight (WoE) of all factors per pixel from the same factorizations.
+    """
+
+    def __init__(
+        self,
+        rasterArrays,
+        lsArray: np.ndarray,
+        noData=-9999,
+        names=None,
+        method=WoE,
+    ):
+        self.noData = noData
+        self.names = names or [f"factor{i + 1}" for i in range(len(rasterArrays))]
+        if len(set(self.names)) < len(self.names) or set(self.names) & set(unitColumns):
+            raise ValueError(
+                f"names have to be unique and not one of {unitColumns}, see getUniqueNames"
+            )
+        with stage("FactorStack.count", lsArray=lsArray):
+            lsMask = (lsArray != noData) & (lsArray != 0)
+            self.lsTotalCount = int(np.count_nonzero(lsMask))
+            self.classValues = []
+            self.codeArrays = []
+            self.resultsTables = []
+            for rasterArray in rasterArrays:
+                classValues, codes = factorizeArray(rasterArray, noData)
+                if codes.shape != lsMask.shape:
+                    raise ValueError("All rasters must have the shape of lsArray")
+                binCount = len(classValues) + 1  # last bin = noData
+                classCount = np.bincount(codes.ravel(), minlength=binCount)[:-1]
+                lsClassCount = np.bincount(codes[lsMask], minlength=binCount)[:-1]
+                self.classValues.append(classValues)
+                self.codeArrays.append(codes)
+                self.resultsTables.append(
+                    method.fromCounts(
+                        classValues,
+                        classCount,
+                        lsClassCount,
+                        self.lsTotalCount,
+                        classCount.sum(),
+                    ).resultsTable
+                )
+        self.lsMask = lsMask
+        self.units = self.unitCodes = None
+
+    @classmethod
+    def fromRasters(
+        cls,
+        rasterPaths,
+        lsArray: np.ndarray,
+        bandNrs=None,
+        noData=-9999,
+        names=None,
+        method=WoE,
+        storeDir=None,
+    ) -> "FactorStack":
+        """Returns the FactorStack of the rasters at rasterPaths (band bandNrs[i] of each, by
+        default 1) or, with rasterPaths being one path, of the bands bandNrs of that multi-band
+        raster. storeDir is passed to raster2Array. The names default to the file names or band
+        numbers, made unique with getUniqueNames.
+        """
+        from .toArray import raster2Array
+
+        if isinstance(rasterPaths, str):
+            bandNrs = bandNrs or [1]
+            rasterArrays = raster2Array(rasterPaths, bandNrs, storeDir)
+            names = names or getUniqueNames([f"band{bandNr}" for bandNr in bandNrs])
+        else:
+            bandNrs = bandNrs or [1] * len(rasterPaths)
+            rasterArrays = [
+                raster2Array(rasterPath, bandNr, storeDir)
+                for rasterPath, bandNr in zip(rasterPaths, bandNrs)
+            ]
+            names = names or getUniqueNames(
+                [
+                    os.path.splitext(os.path.basename(rasterPath))[0]
+                    for rasterPath in rasterPaths
+                ]
+            )
+        return cls(rasterArrays, lsArray, noData, names, method)
+
+    def getUnits(self) -> tuple:
+        """Returns a tuple (units, unitCodes), the unique condition units of the factors (see
+        combineCodes), a code of len(classValues) means noData in that factor.
+        """
+        if self.units is None:
+            with stage("FactorStack.units"):
+                self.units, self.unitCodes = combineCodes(
+                    self.codeArrays,
+                    [len(classValues) + 1 for classValues in self.classValues],
+                )
+        return self.units, self.unitCodes
+
+    def getUnitTable(self, column="classWeight") -> np.ndarray:
+        """Returns a Numpy Array with one row per unique condition unit without noData in any
+        factor: the class value of each factor (named after names), unitCount, lsUnitCount,
+        weightSum (sum of column of the classes of the unit) and posteriorProbability.
+        For WoE the posterior logit is the prior logit ln(lsTotalCount / stable pixels) plus
+        weightSum, because each classWeight already holds W⁺ of its class and W⁻ of all others.
+        Landslides and stable pixels are counted over the pixels valid in every factor.
+        """
+        units, unitCodes = self.getUnits()
+        valid = np.all(
+            units < [len(classValues) for classValues in self.classValues], axis=1
+        )
+        unitCount = np.bincount(unitCodes.ravel(), minlength=len(units))
+        lsUnitCount = np.bincount(unitCodes[self.lsMask], minlength=len(units))
+        weightSums = self.getUnitWeightSums(column)
+        unitTable = np.zeros(
+            shape=(np.count_nonzero(valid),),
+            dtype=[(name, "f") for name in self.names]
+            + [
+                ("unitCount", "i"),
+                ("lsUnitCount", "i"),
+                ("weightSum", "f"),
+                ("posteriorProbability", "f"),
+            ],
+        )
+        for i, (name, classValues) in enumerate(zip(self.names, self.classValues)):
+            unitTable[name] = classValues[units[valid, i]]
+        unitTable["unitCount"] = unitCount[valid]
+        unitTable["lsUnitCount"] = lsUnitCount[valid]
+        unitTable["weightSum"] = weightSums[valid]
+        lsCount = lsUnitCount[valid].sum()
+        priorLogit = np.log(lsCount / (unitCount[valid].sum() - lsCount))
+        unitTable["posteriorProbability"] = 1 / (
+            1 + np.exp(-(priorLogit + weightSums[valid]))
+        )
+        return unitTable
+
+    def getUnitWeightSums(self, column="classWeight") -> np.ndarray:
+        """Returns the sum of column of the resultsTables over all factors for every unit (see
+        getUnits), NaN for units with noData in any factor.
+        """
+        units, _ = self.getUnits()
+        weightSums = np.zeros(len(units))
+        for i, resultsTable in enumerate(self.resultsTables):
+            weights = np.append(resultsTable[column].astype(np.float64), np.nan)
+            weightSums += weights[units[:, i]]
+        return weightSums
+
+    def getWeightSumArray(self, column="classWeight", dtype=np.float32) -> np.ndarray:
+        """Returns the summed posterior weight raster: per pixel the sum of column (classWeight
+        of WoE by default) of its class in every factor, noData where any factor is noData.
+        Looks up the unit of every pixel once instead of adding one weight raster per factor.
+        """
+        _, unitCodes = self.getUnits()
+        weightSums = self.getUnitWeightSums(column)
+        weightSums[np.isnan(weightSums)] = self.noData
+        with stage("FactorStack.weightSum", unitCodes=unitCodes):
+            return weightSums.astype(dtype)[unitCodes]
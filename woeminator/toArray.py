@@ -0,0 +1,337 @@
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .cache import NpyCache, getCacheKey, getFileStamp
+from .instrument import instrumented
+from .npyBackend import isNpyPath, npy2Array
+
+# GDAL is imported on first use, so the module (and the numpy backend) works without it.
+
+
+@instrumented("vector2Array")
+def vector2Array(
+    vectorPath: str,
+    maskRasterPath: str,
+    burnField: str,
+    noData=-9999,
+    cacheDir=None,
+    cacheBytes=2**32,
+    window=None,
+    allTouched=False,
+    tileSize=None,
+    workers=None,
+):
+    """Returns an array of the vector at vectorPath inside the maskRaster a maskRastPath.
+    burnField should be unique integer for each Feauture > 0.
+    0 means there is no shape in that location. noData indicates that it is outside the mask
+    raster (Array has to be rectangular).
+    First we create a temporary Raster in memory and then return its Array.
+    With allTouched every pixel touched by a polygon is burned, not only those with their center
+    inside, so small polygons are not lost.
+    If cacheDir is given the array is cached there as .npy file (at most cacheBytes in total,
+    see cache.NpyCache) and memory-mapped on the next call with the same vector files, burnField,
+    noData, window, allTouched, tileSize and mask raster grid.
+    If window (xOff, yOff, xSize, ySize) is given only that part of the mask raster is
+    rasterized and returned (see getLayerWindow).
+    If tileSize is given the mask grid is split into tiles of tileSize x tileSize pixels that are
+    rasterized in a pool of workers threads (see rasterizeWindow). The tiled array is an
+    approximation: each tile has its own origin, so for polygon edges exactly on pixel centres
+    GDAL may round differently than for the whole grid. Tiling is therefore off by default, use it
+    only if benchmark.checkTiledRasterization reports identical arrays for your GDAL.
+    """
+    from osgeo import gdal
+
+    maskHandle = gdal.Open(maskRasterPath, gdal.GA_ReadOnly)
+    if window is None:
+        window = (0, 0, maskHandle.RasterXSize, maskHandle.RasterYSize)
+    if cacheDir is not None:
+        vectorCache = NpyCache(cacheDir, cacheBytes)
+        cacheKey = getCacheKey(
+            "vector2Array",
+            getFileStamp(vectorPath),
+            burnField,
+            noData,
+            maskHandle.GetGeoTransform(),
+            maskHandle.RasterXSize,
+            maskHandle.RasterYSize,
+            window,
+            allTouched,
+            tileSize,
+        )
+        cachedArray = vectorCache.get(cacheKey)
+        if cachedArray is not None:
+            return cachedArray
+    if tileSize is None:
+        lsArray = rasterizeWindow(
+            vectorPath, maskRasterPath, burnField, noData, window, allTouched, False
+        )
+    else:
+        xOff, yOff, xRes, yRes = window
+        tiles = [
+            (xOff + tileXOff, yOff + tileYOff, xSize, ySize)
+            for tileXOff, tileYOff, xSize, ySize in getWindows(
+                xRes, yRes, tileSize, tileSize, 1, tileSize * tileSize
+            )
+        ]
+        lsArray = np.empty((yRes, xRes), dtype=np.int16)
+        with ThreadPoolExecutor(workers) as pool:
+            tileArrays = pool.map(
+                lambda tile: rasterizeWindow(
+                    vectorPath, maskRasterPath, burnField, noData, tile, allTouched
+                ),
+                tiles,
+            )
+            for (tileXOff, tileYOff, xSize, ySize), tileArray in zip(tiles, tileArrays):
+                lsArray[
+                    tileYOff - yOff : tileYOff - yOff + ySize,
+                    tileXOff - xOff : tileXOff - xOff + xSize,
+                ] = tileArray
+    if cacheDir is not None:
+        return vectorCache.put(cacheKey, lsArray)
+    return lsArray
+
+
+def rasterizeWindow(
+    vectorPath: str,
+    maskRasterPath: str,
+    burnField: str,
+    noData=-9999,
+    window=None,
+    allTouched=False,
+    spatialFilter=True,
+) -> np.ndarray:
+    """Returns the window (xOff, yOff, xSize, ySize) of the mask raster at maskRasterPath with
+    the vector at vectorPath burned in (see vector2Array), by default the whole mask raster.
+    Opens its own datasets, so windows can be rasterized in parallel threads. With spatialFilter
+    only the features near the window are read. The features keep their order, so overlapping
+    polygons are burned like in the whole mask raster.
+    """
+    from osgeo import gdal, ogr
+
+    maskHandle = gdal.Open(maskRasterPath, gdal.GA_ReadOnly)
+    if window is None:
+        window = (0, 0, maskHandle.RasterXSize, maskHandle.RasterYSize)
+    xOff, yOff, xRes, yRes = window
+    vector = ogr.Open(vectorPath)
+    vectorLayer = vector.GetLayer()
+    xMin, xSize, _, yMax, _, ySize = maskHandle.GetGeoTransform()  # _ are always 0
+    if spatialFilter:
+        # one pixel of margin, features only touching the window can still touch its pixels
+        vectorLayer.SetSpatialFilterRect(
+            xMin + (xOff - 1) * xSize,
+            yMax + (yOff + yRes + 1) * ySize,
+            xMin + (xOff + xRes + 1) * xSize,
+            yMax + (yOff - 1) * ySize,
+        )
+    tmpRaster = gdal.GetDriverByName("MEM").Create("", xRes, yRes, 1, gdal.GDT_Int16)
+    # If we write to a file it will lack the the Projection Information, but it is not
+    # necessary for calculation with array data. If necessary use:
+    # tmpRaster.SetProjection(maskHandle.GetProjection())
+    tmpRaster.SetGeoTransform(
+        (xMin + xOff * xSize, xSize, 0, yMax + yOff * ySize, 0, ySize)
+    )
+    band = tmpRaster.GetRasterBand(1)
+    band.SetNoDataValue(noData)
+    options = [f"ATTRIBUTE={burnField}"]
+    if allTouched:
+        options.append("ALL_TOUCHED=TRUE")
+    gdal.RasterizeLayer(tmpRaster, [1], vectorLayer, options=options)
+    return band.ReadAsArray()
+
+
+@instrumented("raster2Array")
+def raster2Array(rasterPath: str, bandNr=1, storeDir=None) -> np.ndarray:
+    """Returns a Numpy Array of the raster at rasterPath of band bandNr.
+    bandNr can also be a list of bands, then a 3D array (band, row, column) with these bands of
+    the multi-band raster is returned (see stack.FactorStack).
+    If storeDir is given the band is converted once into a raw .npy file there (see storeRaster)
+    and returned as copy-on-write np.memmap as long as the raster did not change, so processes
+    loading the same raster share its pages.
+    .npy and .npz files are read without GDAL (see npyBackend), storeDir is ignored for them.
+    Loading a valid store entry does not need GDAL either, only storing the raster does.
+    """
+    if isNpyPath(rasterPath):
+        if isinstance(bandNr, (list, tuple)):
+            return np.stack([npy2Array(rasterPath, band) for band in bandNr])
+        return npy2Array(rasterPath, bandNr)
+    if isinstance(bandNr, (list, tuple)):
+        if storeDir is not None:
+            return np.stack(
+                [raster2Array(rasterPath, band, storeDir) for band in bandNr]
+            )
+        from osgeo import gdal
+
+        handle = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+        return np.stack([handle.GetRasterBand(band).ReadAsArray() for band in bandNr])
+    if storeDir is not None:
+        if getStoredRasterInfo(rasterPath, storeDir, bandNr) is None:
+            storeRaster(rasterPath, storeDir, bandNr)
+        return np.load(
+            getStorePath(rasterPath, storeDir, bandNr) + ".npy", mmap_mode="c"
+        )
+    from osgeo import gdal
+
+    handle = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+    return handle.GetRasterBand(bandNr).ReadAsArray()
+
+
+def getStorePath(rasterPath: str, storeDir: str, bandNr=1) -> str:
+    """Returns the path (without extension) of the store entry of band bandNr of rasterPath."""
+    name = os.path.splitext(os.path.basename(rasterPath))[0]
+    key = getCacheKey(os.path.abspath(rasterPath), bandNr)[:16]
+    return os.path.join(storeDir, f"{name}_{bandNr}_{key}")
+
+
+def storeRaster(rasterPath: str, storeDir: str, bandNr=1) -> dict:
+    """Converts band bandNr of the raster at rasterPath into a raw .npy file in storeDir and
+    returns the sidecar info written next to it as .json: geoTransform, projection, noData and
+    the size and mtime of the raster files to detect changes (see getStoredRasterInfo).
+    """
+    from osgeo import gdal
+
+    os.makedirs(storeDir, exist_ok=True)
+    storePath = getStorePath(rasterPath, storeDir, bandNr)
+    handle = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+    band = handle.GetRasterBand(bandNr)
+    info = {
+        "rasterPath": os.path.abspath(rasterPath),
+        "bandNr": bandNr,
+        "geoTransform": handle.GetGeoTransform(),
+        "projection": handle.GetProjection(),
+        "noData": band.GetNoDataValue(),
+        "fileStamp": getFileStamp(rasterPath),
+    }
+    tmpSuffix = f".{os.getpid()}.tmp"
+    with open(storePath + ".npy" + tmpSuffix, "wb") as tmpFile:
+        np.save(tmpFile, band.ReadAsArray())
+    with open(storePath + ".json" + tmpSuffix, "w") as tmpFile:
+        json.dump(info, tmpFile)
+    # The .npy first: a .json always describes a complete .npy
+    os.replace(storePath + ".npy" + tmpSuffix, storePath + ".npy")
+    os.replace(storePath + ".json" + tmpSuffix, storePath + ".json")
+    return info
+
+
+def getStoredRasterInfo(rasterPath: str, storeDir: str, bandNr=1):
+    """Returns the sidecar info (see storeRaster) of the store entry of band bandNr of rasterPath
+    or None if there is no entry or the raster changed since it was stored.
+    """
+    try:
+        with open(getStorePath(rasterPath, storeDir, bandNr) + ".json") as infoFile:
+            info = json.load(infoFile)
+    except FileNotFoundError:
+        return None
+    if [list(stamp) for stamp in getFileStamp(rasterPath)] != info["fileStamp"]:
+        return None
+    return info
+
+
+def getLayerWindow(vectorPath: str, maskRasterPath: str):
+    """Returns the window (xOff, yOff, xSize, ySize) of the mask raster at maskRasterPath that
+    covers the extent of the vector at vectorPath, or None if they do not overlap.
+    """
+    from osgeo import gdal, ogr
+
+    maskHandle = gdal.Open(maskRasterPath, gdal.GA_ReadOnly)
+    xMin, xSize, _, yMax, _, ySize = maskHandle.GetGeoTransform()  # _ are always 0
+    vector = ogr.Open(vectorPath)
+    layerXMin, layerXMax, layerYMin, layerYMax = vector.GetLayer().GetExtent()
+    left = max(0, math.floor((layerXMin - xMin) / xSize))
+    right = min(maskHandle.RasterXSize, math.ceil((layerXMax - xMin) / xSize))
+    top = max(0, math.floor((layerYMax - yMax) / ySize))  # ySize is negative
+    bottom = min(maskHandle.RasterYSize, math.ceil((layerYMin - yMax) / ySize))
+    if left >= right or top >= bottom:
+        return None
+    return left, top, right - left, bottom - top
+
+
+def getRasterSize(rasterPath: str) -> tuple:
+    """Returns (xRes, yRes), the columns and rows of the raster at rasterPath."""
+    if isNpyPath(rasterPath):
+        yRes, xRes = npy2Array(rasterPath).shape
+        return xRes, yRes
+    from osgeo import gdal
+
+    handle = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+    return handle.RasterXSize, handle.RasterYSize
+
+
+def readWindow(rasterPath: str, window: tuple, bandNr=1) -> np.ndarray:
+    """Returns the window (xOff, yOff, xSize, ySize) of band bandNr of the raster at rasterPath."""
+    if isNpyPath(rasterPath):
+        xOff, yOff, xSize, ySize = window
+        return np.array(
+            npy2Array(rasterPath, bandNr)[yOff : yOff + ySize, xOff : xOff + xSize]
+        )
+    from osgeo import gdal
+
+    handle = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+    return handle.GetRasterBand(bandNr).ReadAsArray(*window)
+
+
+def getWindows(
+    xRes: int,
+    yRes: int,
+    blockXSize: int,
+    blockYSize: int,
+    bytesPerPixel: int,
+    windowBudget: int,
+) -> list:
+    """Returns a list of (xOff, yOff, xSize, ySize) windows covering a raster of xRes x yRes
+    pixels. Windows are aligned to the blocks of the raster and hold at most windowBudget bytes
+    (bytesPerPixel bytes per pixel), but at least one block.
+    Full-width strips of whole block rows are preferred, else a row of blocks is split.
+    """
+    stripBytes = xRes * blockYSize * bytesPerPixel
+    if stripBytes <= windowBudget:
+        xSize = xRes
+        ySize = windowBudget // stripBytes * blockYSize
+    else:
+        blocksPerWindow = windowBudget // (blockXSize * blockYSize * bytesPerPixel)
+        xSize = max(1, blocksPerWindow) * blockXSize
+        ySize = blockYSize
+    return [
+        (xOff, yOff, min(xSize, xRes - xOff), min(ySize, yRes - yOff))
+        for yOff in range(0, yRes, ySize)
+        for xOff in range(0, xRes, xSize)
+    ]
+
+
+def iterRasterBlocks(rasterPaths: list, bandNrs=None, windowBudget=2**26):
+    """Yields (xOff, yOff, arrays) with arrays being a list of the same window of each raster in
+    rasterPaths, so all rasters are read in lockstep. bandNrs is a list with the band to read of
+    each raster, by default band 1.
+    The rasters must have the same size. The windows are aligned to the natural block size of the
+    first raster and need at most windowBudget bytes over all rasters (see getWindows).
+    """
+    from osgeo import gdal
+
+    handles = [gdal.Open(rasterPath, gdal.GA_ReadOnly) for rasterPath in rasterPaths]
+    bands = [
+        handle.GetRasterBand(bandNr)
+        for handle, bandNr in zip(handles, bandNrs or [1] * len(handles))
+    ]
+    xRes = handles[0].RasterXSize
+    yRes = handles[0].RasterYSize
+    for rasterPath, handle in zip(rasterPaths, handles):
+        if (handle.RasterXSize, handle.RasterYSize) != (xRes, yRes):
+            raise ValueError(
+                f"{rasterPath} does not match the size of {rasterPaths[0]}"
+            )
+    blockXSize, blockYSize = bands[0].GetBlockSize()
+    bytesPerPixel = sum(gdal.GetDataTypeSize(band.DataType) // 8 for band in bands)
+    for xOff, yOff, xSize, ySize in getWindows(
+        xRes, yRes, blockXSize, blockYSize, bytesPerPixel, windowBudget
+    ):
+        yield xOff, yOff, [band.ReadAsArray(xOff, yOff, xSize, ySize) for band in bands]
+
+
+if __name__ == "__main__":
+    import time
+
+    t1 = time.perf_counter()
+    x = vector2Array("testdata/landslides.shp", "testdata/AW3D30.tif", "number")
+    t2 = time.perf_counter()
+    print(t2 - t1)
@@ -0,0 +1,171 @@
+import numpy as np
+from .classify import classifyArray
+from .instrument import instrumented
+from .npyBackend import array2Npy, getNpyInfo, isNpyPath
+from .reclassify import getReclassIndices
+from .toArray import getWindows
+
+# GDAL is imported on first use, gdalType defaults to gdal.GDT_Float32 (None).
+
+
+@instrumented("array2Raster")
+def array2Raster(
+    array: np.ndarray,
+    maskRasterPath: str,
+    outRasterPath: str,
+    noData=-9999,
+    gdalType=None,
+) -> str:
+    """Returns outRasterPath, the path to the new .tif file.
+    array is the numpy array you want to save as a .tif file
+    maskRasterPath is an existing .tif file from which we take spatial information
+    noData is the value in array that we treat as no Data in the resulting .tif file
+    gdalType is the GDAL pixel data type to use for the resulting .tif (default gdal.GDT_Float32)
+    If outRasterPath is a .npy or .npz file array is written without GDAL (see npyBackend), a .npz
+    keeps noData and the spatial information of a .npz mask raster."""
+    if isNpyPath(outRasterPath):
+        maskInfo = getNpyInfo(maskRasterPath) if isNpyPath(maskRasterPath) else {}
+        return array2Npy(
+            array,
+            outRasterPath,
+            noData,
+            maskInfo.get("geoTransform"),
+            maskInfo.get("projection"),
+        )
+    from osgeo import gdal
+
+    if gdalType is None:
+        gdalType = gdal.GDT_Float32
+    maskRaster = gdal.Open(maskRasterPath)
+    outRaster = gdal.GetDriverByName("Gtiff").Create(
+        outRasterPath, maskRaster.RasterXSize, maskRaster.RasterYSize, 1, gdalType
+    )
+    outRaster.SetProjection(maskRaster.GetProjection())
+    outRaster.SetGeoTransform(maskRaster.GetGeoTransform())
+    outRaster.GetRasterBand(1).SetNoDataValue(noData)
+    outRaster.GetRasterBand(1).WriteArray(array)
+    return outRasterPath
+
+
+@instrumented("reclassifyRaster")
+def reclassifyRaster(
+    rasterPath: str,
+    outRasterPath: str,
+    resultsTable: np.ndarray,
+    column="classWeight",
+    noData=-9999,
+    bandNr=1,
+    gdalType=None,
+    creationOptions=(
+        "TILED=YES",
+        "BLOCKXSIZE=256",
+        "BLOCKYSIZE=256",
+        "COMPRESS=DEFLATE",
+        "BIGTIFF=IF_SAFER",
+    ),
+    overviews=None,
+    overviewResampling="NEAREST",
+    windowBudget=2**26,
+    breaks=None,
+) -> str:
+    """Returns outRasterPath, the path to the new .tif file.
+    Reads band bandNr of the raster at rasterPath window by window, replaces each class value
+    (resultsTable["classValue"]) with resultsTable[column] and writes the window to a GeoTIFF
+    created with creationOptions (tiled and compressed by default). Memory use is bounded by
+    windowBudget bytes per window, the windows are aligned to the tiles of the output.
+    noData and values missing in resultsTable become noData in the output.
+    overviews is an optional list of overview factors (e.g. [2, 4, 8]) built with
+    overviewResampling.
+    For a continuous raster pass the breaks used for the resultsTable (see classify.getBreaks),
+    each window is then classified with classify.classifyArray first.
+    """
+    return reclassifyRasters(
+        rasterPath,
+        [outRasterPath],
+        resultsTable,
+        [column],
+        noData,
+        bandNr,
+        gdalType,
+        creationOptions,
+        overviews,
+        overviewResampling,
+        windowBudget,
+        breaks,
+    )[0]
+
+
+@instrumented("reclassifyRasters")
+def reclassifyRasters(
+    rasterPath: str,
+    outRasterPaths: list,
+    resultsTable: np.ndarray,
+    columns: list,
+    noData=-9999,
+    bandNr=1,
+    gdalType=None,
+    creationOptions=(
+        "TILED=YES",
+        "BLOCKXSIZE=256",
+        "BLOCKYSIZE=256",
+        "COMPRESS=DEFLATE",
+        "BIGTIFF=IF_SAFER",
+    ),
+    overviews=None,
+    overviewResampling="NEAREST",
+    windowBudget=2**26,
+    breaks=None,
+) -> list:
+    """Returns outRasterPaths, writes one raster per column of resultsTable in the same pass.
+    Like reclassifyRaster, but each window is read and its classes are looked up only once for
+    all outRasterPaths (outRasterPaths[i] gets resultsTable[columns[i]]).
+    """
+    from osgeo import gdal, gdal_array
+
+    if gdalType is None:
+        gdalType = gdal.GDT_Float32
+    inRaster = gdal.Open(rasterPath, gdal.GA_ReadOnly)
+    inBand = inRaster.GetRasterBand(bandNr)
+    xRes = inRaster.RasterXSize
+    yRes = inRaster.RasterYSize
+    outType = np.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(gdalType))
+    outRasters = []
+    # replacement of each class, then not found and noData (see getReclassIndices)
+    tables = []
+    for outRasterPath, column in zip(outRasterPaths, columns):
+        outRaster = gdal.GetDriverByName("GTiff").Create(
+            outRasterPath, xRes, yRes, 1, gdalType, options=list(creationOptions)
+        )
+        outRaster.SetProjection(inRaster.GetProjection())
+        outRaster.SetGeoTransform(inRaster.GetGeoTransform())
+        outRaster.GetRasterBand(1).SetNoDataValue(noData)
+        outRasters.append(outRaster)
+        tables.append(np.append(resultsTable[column], [noData, noData]).astype(outType))
+    bytesPerPixel = (
+        gdal.GetDataTypeSize(inBand.DataType) // 8
+        + 8  # class indices
+        + outType.itemsize * len(outRasters)
+    )
+    blockXSize, blockYSize = outRasters[0].GetRasterBand(1).GetBlockSize()
+    for xOff, yOff, xSize, ySize in getWindows(
+        xRes, yRes, blockXSize, blockYSize, bytesPerPixel, windowBudget
+    ):
+        block = inBand.ReadAsArray(xOff, yOff, xSize, ySize)
+        if breaks is not None:
+            block = classifyArray(block, breaks, noData)
+        indices = getReclassIndices(block, resultsTable["classValue"], noData)
+        for outRaster, table in zip(outRasters, tables):
+            outRaster.GetRasterBand(1).WriteArray(np.take(table, indices), xOff, yOff)
+    for outRaster in outRasters:
+        if overviews:
+            outRaster.BuildOverviews(overviewResampling, list(overviews))
+        outRaster.FlushCache()
+    return outRasterPaths
+
+
+if __name__ == "__main__":
+    from .toArray import vector2Array
+
+    array = vector2Array("testdata/landslides.shp", "testdata/AW3D30.tif", "number")
+    maskRasterPath = "testdata/AW3D30.tif"
+    array2Raster(array, maskRasterPath, "out.tif")
@@ -0,0 +1,292 @@
+import numpy as np
+from .instrument import stage
+from .sharedCalcFunctions import (
+    PartialCounts,
+    getClassCounts,
+    getEnsembleResultsTables,
+    getLandslideTotalCount,
+    getRasterFileCounts,
+    getTotalCount,
+)
+
+
+class WoE:
+    """After calling WoE(raster, landslides, noData) WoE.resultsTable contains the results of the
+    calculation (see getResultsTableWoE).
+    """
+
+    def __init__(self, rasterArray: np.ndarray, lsArray: np.ndarray, noData=-9999):
+        with stage("WoE.count", rasterArray=rasterArray, lsArray=lsArray):
+            lsTotalCount = getLandslideTotalCount(
+                lsArray, noData, 0
+            )  # 0 = noLandslideValue
+            totalCount = getTotalCount(rasterArray, noData)
+            classValues, classCount, lsClassCount = getClassCounts(
+                rasterArray, lsArray, noData
+            )
+        with stage("WoE.resultsTable"):
+            self.fillResultsTable(
+                classValues, classCount, lsClassCount, lsTotalCount, totalCount
+            )
+
+    @classmethod
+    def fromCounts(
+        cls,
+        classValues: np.ndarray,
+        classCount: np.ndarray,
+        lsClassCount: np.ndarray,
+        lsTotalCount: int,
+        totalCount: int,
+    ) -> "WoE":
+        """Returns a WoE with a resultsTable calculated from already counted pixels
+        (see fillResultsTable) instead of a raster and a landslide array.
+        """
+        woe = cls.__new__(cls)
+        woe.fillResultsTable(
+            classValues, classCount, lsClassCount, lsTotalCount, totalCount
+        )
+        return woe
+
+    @classmethod
+    def fromPartialCounts(cls, partialCounts: PartialCounts) -> "WoE":
+        """Returns a WoE with a resultsTable calculated from partialCounts, e.g. the sum of the
+        PartialCounts of all tiles of a raster.
+        """
+        return cls.fromCounts(
+            partialCounts.classValues,
+            partialCounts.classCount,
+            partialCounts.lsClassCount,
+            partialCounts.lsTotalCount,
+            partialCounts.totalCount,
+        )
+
+    @classmethod
+    def fromRasterFiles(
+        cls,
+        rasterPath: str,
+        lsRasterPath: str,
+        noData=-9999,
+        bandNr=1,
+        windowBudget=2**26,
+        breaks=None,
+    ) -> "WoE":
+        """Returns a WoE calculated from the raster at rasterPath (band bandNr) and the landslide
+        raster at lsRasterPath without loading either of them completely. The counts are
+        accumulated window by window, each window of both rasters needs at most windowBudget
+        bytes (see toArray.iterRasterBlocks). The resultsTable matches WoE(raster, landslides).
+        For a continuous raster pass breaks (see classify.getBreaks) to classify each window
+        with classify.classifyArray first.
+        """
+        return cls.fromPartialCounts(
+            getRasterFileCounts(
+                rasterPath, lsRasterPath, noData, bandNr, windowBudget, breaks
+            )
+        )
+
+    def fillResultsTable(
+        self,
+        classValues: np.ndarray,
+        classCount: np.ndarray,
+        lsClassCount: np.ndarray,
+        lsTotalCount: int,
+        totalCount: int,
+    ) -> np.ndarray:
+        """Creates and returns self.resultsTable from the per class counts.
+        Every column is calculated as a whole-array operation.
+        """
+        totalStableCount = totalCount - lsTotalCount
+        self.resultsTable = self.getResultsTableWoE(len(classValues))
+        table = self.resultsTable
+        table["classValue"] = classValues
+        table["classCount"] = classCount
+        table["lsClassCount"] = lsClassCount
+        table["stableClassCount"] = table["classCount"] - table["lsClassCount"]
+        table["classPositiveWeight"] = self.getPositiveWeight(
+            table["lsClassCount"],
+            lsTotalCount,
+            table["stableClassCount"],
+            totalStableCount,
+        )
+        table["lsOutClassCount"] = lsTotalCount - table["lsClassCount"]
+        table["stableOutClassCount"] = totalStableCount - table["stableClassCount"]
+        table["classNegativeWeight"] = self.getNegativeWeight(
+            table["lsOutClassCount"],
+            lsTotalCount,
+            table["stableOutClassCount"],
+            totalStableCount,
+        )
+        table["classContrast"] = (
+            table["classPositiveWeight"] - table["classNegativeWeight"]
+        )
+        table["classPositiveVariance"] = self.getClassPositiveVariance(
+            table["lsClassCount"], table["stableClassCount"]
+        )
+        table["classNegativeVariance"] = self.getClassNegativeVariance(
+            table["lsOutClassCount"], table["stableOutClassCount"]
+        )
+        totalNegativeWeight = sum(table["classNegativeWeight"])
+        totalNegativeVariance = sum(table["classNegativeVariance"])
+        table["classWeight"] = self.getWeight(
+            table["classPositiveWeight"],
+            totalNegativeWeight,
+            table["classNegativeWeight"],
+        )
+        table["classVariance"] = self.getVariance(
+            table["classPositiveVariance"],
+            totalNegativeVariance,
+            table["classNegativeVariance"],
+        )
+        return self.resultsTable
+
+    def getResultsTableWoE(self, classArrayCount: int) -> np.ndarray:
+        """Returns a Numpy Array, to be filled with the calculation results.
+        The size of the of the array is based on the number of classes in the input Layer.
+        """
+        return np.zeros(
+            shape=(classArrayCount,),
+            dtype=[
+                ("classValue", "f"),
+                ("classCount", "i"),
+                ("lsClassCount", "i"),
+                ("stableClassCount", "i"),
+                ("classPositiveWeight", "f"),
+                ("classNegativeWeight", "f"),
+                ("lsOutClassCount", "i"),
+                ("stableOutClassCount", "i"),
+                ("classContrast", "f"),
+                ("classPositiveVariance", "f"),
+                ("classNegativeVariance", "f"),
+                ("classWeight", "f"),
+                ("classVariance", "f"),
+            ],
+        )
+
+    def getPositiveWeight(
+        self,
+        lsClassCount: int,
+        lsTotalCount: int,
+        stableClassCount: int,
+        totalStableCount: int,
+    ) -> float:
+        """Returns the positive Weight of a class.
+        W⁺ = ln(P(Class | Landslide) / P(Class | no Landslide))
+        P(Class | Landslide): P (Class ∩ Landslide) / P(Landslide)
+        P(Class | no Landslide): P (Class ∩ no Landslide) / P(no Landslide)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positiveWeight = np.log(
+                (lsClassCount / lsTotalCount) / (stableClassCount / totalStableCount)
+            )
+        # 0 = no landslides in class
+        return np.where(lsClassCount > 0, positiveWeight, 0)
+
+    def getNegativeWeight(
+        self,
+        lsOutClassCount: int,
+        lsTotalCount: int,
+        stableOutClassCount: int,
+        totalStableCount: int,
+    ) -> float:
+        """Returns the negative Weight of a class.
+        W⁻ = ln(P(not Class | Landslide) / P(not Class | no Landslide))
+        P(not Class | Landslide): P (not Class ∩ Landslide) / P(Landslide)
+        P(not Class | no Landslide): P (not Class ∩ no Landslide) / P(no Landslide)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.log(
+                (lsOutClassCount / lsTotalCount)
+                / (stableOutClassCount / totalStableCount)
+            )
+
+    def getClassPositiveVariance(
+        self, lsClassCount: int, stableClassCount: int
+    ) -> float:
+        """Returns the Variance of the positive Weight.
+        σ²(W⁺) = 1 / (Class ∩ Landslide) + 1 / (Class ∩ no Landslide)
+        """
+        with np.errstate(divide="ignore"):
+            positiveVariance = 1 / lsClassCount + 1 / stableClassCount
+        # 0 = no landslides in class
+        return np.where(lsClassCount > 0, positiveVariance, 0)
+
+    def getClassNegativeVariance(
+        self, lsOutClassCount: int, stableOutClassCount: int
+    ) -> float:
+        """Returns the Variance of the positive Weight.
+        σ²(W⁻) = 1 / (not Class ∩ Landslide) + 1 / (not Class ∩ no Landslide)
+        """
+        with np.errstate(divide="ignore"):
+            return 1 / lsOutClassCount + 1 / stableOutClassCount
+
+    def getWeight(
+        self,
+        positiveClassWeight: float,
+        totalNegativeWeight: float,
+        negativeClassWeight: float,
+    ) -> float:
+        """Returns the Weight of Evidence for a class.
+        W = W⁺ + ΣW⁻ - W⁻
+        W⁺: Positive Weight of the class
+        ΣW⁻: Sum of all negatie Weights
+        W⁻: Negative Weight of the class
+        """
+        return positiveClassWeight + totalNegativeWeight - negativeClassWeight
+
+    def getVariance(
+        self,
+        positiveClassVariance: float,
+        totalNegativeVariance: float,
+        negativeClassVariance: float,
+    ) -> float:
+        """Returns the Variance for a class.
+        σ² = σ²(W⁺) + Σσ²(W⁻) - σ²(W⁻)
+        σ²(W⁺): Positive Variance of the class
+        Σσ²(W⁻): Sum of all negative Variances
+        σ²(W⁻): Negative Variance of the class
+        """
+        return positiveClassVariance + totalNegativeVariance - negativeClassVariance
+
+
+class WoEEnsemble:
+    """After calling WoEEnsemble(raster, landslides, count, percent, seed, noData)
+    WoEEnsemble.resultsTables contains one resultsTable (see WoE.getResultsTableWoE) for each
+    of count random training subsamples with percent % of the landslides.
+    Expects landslides to hold an individual ID for each landslide (see vector2Array), 0 means no
+    landslide. The subsamples are the same getRandomArrays draws for the same count, percent and
+    seed, but the raster is only scanned once: a (landslide ID x class) table is counted and every
+    subsample is derived from it with a matrix product over the ID memberships.
+    """
+
+    def __init__(
+        self,
+        rasterArray: np.ndarray,
+        lsArray: np.ndarray,
+        count: int,
+        percent=80,
+        seed=42,
+        noData=-9999,
+    ):
+        self.lsIds, self.memberships, self.resultsTables = getEnsembleResultsTables(
+            WoE, rasterArray, lsArray, count, percent, seed, noData
+        )
+
+
+if __name__ == "__main__":
+    import time
+    from . import toArray
+    from . import randomize
+    from . import arrayWork
+
+    t1 = time.perf_counter()
+    lsArray = toArray.vector2Array(
+        "testdata/landslides.shp", "testdata/AW3D30.tif", "number"
+    )
+    rasterArray = toArray.raster2Array("testdata/geology.tif")
+    trainList, valList = randomize.getRandomArrays(lsArray, 1, 100)
+    trainReadyForCalc = [*map(arrayWork.readyArray4calc, trainList)]
+    print(trainReadyForCalc[0].all() == lsArray.all())
+    for train in trainReadyForCalc:
+        WoEr = WoE(rasterArray, train, -9999)
+        print(WoEr.resultsTable["classWeight"])
+    t2 = time.perf_counter()
+    print(t2 - t1)